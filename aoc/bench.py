@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import subprocess
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from math import ceil
+from pathlib import Path
+from statistics import median, pstdev
+from typing import Any, Callable, Iterable
+
+from .common import read_example, read_input, time_call
+from .config import ROOT
+from .runner import load_day, materialize, with_workers
+
+STAGES = ("parse", "part1", "part2")
+
+HISTORY_PATH = ROOT / "bench_history.jsonl"
+
+
+@dataclass
+class TimingStats:
+    """Several timing samples of the same call (seconds)."""
+    value: Any
+    samples: list[float] = field(default_factory=list)
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        ordered = sorted(self.samples)
+        return ordered[max(0, ceil(0.95 * len(ordered)) - 1)]
+
+    @property
+    def stddev(self) -> float:
+        return pstdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "min": self.min,
+            "median": self.median,
+            "p95": self.p95,
+            "stddev": self.stddev,
+        }
+
+
+def time_repeat(
+    fn: Callable[..., Any],
+    *,
+    setup: Callable[[], tuple[Any, ...]] = tuple,
+    warmup: int = 1,
+    repeat: int = 5,
+) -> TimingStats:
+    """Time fn(*setup()) `repeat` times after `warmup` untimed runs.
+
+    setup() runs untimed before every call, so each call gets fresh arguments.
+    A garbage collection is forced before each sample to keep pauses out of it.
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1")
+
+    for _ in range(warmup):
+        fn(*setup())
+
+    stats = TimingStats(value=None)
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        result = time_call(fn, *args)
+        stats.value = result.value
+        stats.samples.append(result.seconds)
+    return stats
+
+
+@dataclass
+class DayBench:
+    day: int
+    stages: dict[str, TimingStats] = field(default_factory=dict)
+
+
+def bench_day(
+    day: int,
+    *,
+    warmup: int = 1,
+    repeat: int = 5,
+    example: int | None = None,
+) -> DayBench:
+    """Time parse_input, part1 and part2 of a day separately.
+
+    The raw input is read once. Like the day runner, parts get a deep copy of
+    the parsed data for every call (untimed), as solutions are free to mutate it.
+    Parts taking workers= run with workers=1, so pool start-up isn't timed.
+    """
+    module = load_day(day)
+    raw = read_input(day) if example is None else read_example(day, example)
+
+    result = DayBench(day=day)
+    parse = time_repeat(
+        module.parse_input, setup=lambda: (raw,), warmup=warmup, repeat=repeat
+    )
+    result.stages["parse"] = parse
+    data = materialize(parse.value)
+    for stage in STAGES[1:]:
+        solve = getattr(module, stage, None)
+        if solve is None:
+            continue
+        result.stages[stage] = time_repeat(
+            with_workers(solve, 1),
+            setup=lambda: (deepcopy(data),),
+            warmup=warmup,
+            repeat=repeat,
+        )
+    return result
+
+
+def bench_days(
+    days: Iterable[int],
+    *,
+    warmup: int = 1,
+    repeat: int = 5,
+    example: int | None = None,
+) -> list[DayBench]:
+    return [
+        bench_day(day, warmup=warmup, repeat=repeat, example=example)
+        for day in days
+    ]
+
+
+def results_to_json(
+    results: Iterable[DayBench],
+    *,
+    warmup: int,
+    repeat: int,
+    example: int | None = None,
+) -> dict[str, Any]:
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "warmup": warmup,
+            "repeat": repeat,
+            "input": "input" if example is None else f"example{example}",
+        },
+        "results": [
+            {
+                "day": r.day,
+                "stage": stage,
+                **stats.summary(),
+                "samples": stats.samples,
+            }
+            for r in results
+            for stage, stats in r.stages.items()
+        ],
+    }
+
+
+def write_json(path: Path, data: dict[str, Any]) -> None:
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def format_table(results: Iterable[DayBench]) -> str:
+    """Return a fixed-width table of the timing summaries (milliseconds)."""
+    header = f"{'day':>3}  {'stage':<6} {'min ms':>10} {'median ms':>10} {'p95 ms':>10} {'stddev ms':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        for stage, stats in r.stages.items():
+            s = stats.summary()
+            lines.append(
+                f"{r.day:>3}  {stage:<6} "
+                + " ".join(f"{s[k] * 1000:>10.3f}" for k in ("min", "median", "p95", "stddev"))
+            )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# History and regression checks
+# ---------------------------------------------------------------------------
+
+def git_commit(ref: str = "HEAD") -> str | None:
+    """Resolve a git ref to a full commit hash (None outside a git checkout)."""
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return None
+    if proc.returncode != 0:
+        return None
+    return proc.stdout.strip()
+
+
+def append_history(
+    results: Iterable[DayBench],
+    *,
+    commit: str | None,
+    input_label: str,
+    path: Path = HISTORY_PATH,
+) -> None:
+    """Append one JSON line per (day, stage) to the history file."""
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    python = platform.python_version()
+    with path.open("a", encoding="utf-8") as f:
+        for r in results:
+            for stage, stats in r.stages.items():
+                record = {
+                    "commit": commit,
+                    "day": r.day,
+                    "stage": stage,
+                    "python": python,
+                    "input": input_label,
+                    "timestamp": timestamp,
+                    **stats.summary(),
+                }
+                f.write(json.dumps(record) + "\n")
+
+
+def load_history(path: Path = HISTORY_PATH) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@dataclass
+class Regression:
+    day: int
+    stage: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def find_regressions(
+    results: Iterable[DayBench],
+    baseline: dict[tuple[int, str], float],
+    *,
+    threshold: float,
+    stages: tuple[str, ...] = ("part1", "part2"),
+) -> list[Regression]:
+    """Stages whose median is more than `threshold` (fraction) slower than baseline."""
+    regressions: list[Regression] = []
+    for r in results:
+        for stage, stats in r.stages.items():
+            if stage not in stages or (r.day, stage) not in baseline:
+                continue
+            reg = Regression(r.day, stage, baseline[(r.day, stage)], stats.median)
+            if reg.ratio > 1 + threshold:
+                regressions.append(reg)
+    return regressions
+
+
+def latest_medians(
+    history: Iterable[dict[str, Any]],
+    *,
+    input_label: str = "input",
+    commit: str | None = None,
+    python: str | None = None,
+) -> dict[tuple[int, str], float]:
+    """Most recent recorded median per (day, stage), optionally for one commit.
+
+    Only records made with the same input and Python version are considered,
+    since timings across interpreters are not comparable.
+    """
+    if python is None:
+        python = platform.python_version()
+    medians: dict[tuple[int, str], float] = {}
+    for rec in history:  # file order is chronological, so later records win
+        if commit is not None and rec["commit"] != commit:
+            continue
+        if rec["input"] == input_label and rec["python"] == python:
+            medians[(rec["day"], rec["stage"])] = rec["median"]
+    return medians
+
+
+# ---------------------------------------------------------------------------
+# Search micro-benchmark: dict-based searches vs CompiledGraph
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SearchBench:
+    name: str
+    plain: TimingStats
+    compiled: TimingStats
+
+    @property
+    def speedup(self) -> float:
+        return self.plain.median / self.compiled.median
+
+
+def bench_search(
+    size: int = 300,
+    *,
+    max_weight: int = 9,
+    warmup: int = 1,
+    repeat: int = 5,
+    seed: int = 0,
+) -> list[SearchBench]:
+    """Time bfs/dijkstra on a size x size grid graph, as dicts and compiled.
+
+    Nodes are (row, col) tuples with random int weights in 1..max_weight, like
+    a typical puzzle grid. Every search goes from one corner to all nodes and
+    then reads the path to the opposite corner, so the cost of mapping results
+    back to nodes is included. Compiling the graph is not timed.
+    """
+    import random
+
+    from .search import bfs, compile_graph, dijkstra
+
+    rng = random.Random(seed)
+    weighted = {
+        (r, c): [
+            ((r + dr, c + dc), rng.randint(1, max_weight))
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if 0 <= r + dr < size and 0 <= c + dc < size
+        ]
+        for r in range(size)
+        for c in range(size)
+    }
+    plain = {node: [n for n, _ in edges] for node, edges in weighted.items()}
+    compiled_weighted = compile_graph(weighted, weighted=True)
+    compiled_plain = compile_graph(plain)
+    start, end = (0, 0), (size - 1, size - 1)
+
+    def _timed(search: Callable[[], Any]) -> TimingStats:
+        return time_repeat(
+            lambda: search().path_to(end), warmup=warmup, repeat=repeat
+        )
+
+    return [
+        SearchBench(
+            "bfs",
+            _timed(lambda: bfs([start], plain.__getitem__)),
+            _timed(lambda: bfs([start], compiled_plain)),
+        ),
+        SearchBench(
+            "dijkstra (heap)",
+            _timed(lambda: dijkstra([start], weighted.__getitem__)),
+            _timed(lambda: dijkstra([start], compiled_weighted)),
+        ),
+        SearchBench(
+            f"dijkstra (max_weight={max_weight})",
+            _timed(lambda: dijkstra([start], weighted.__getitem__, max_weight=max_weight)),
+            _timed(lambda: dijkstra([start], compiled_weighted)),
+        ),
+    ]
+
+
+def format_search_table(results: Iterable[SearchBench]) -> str:
+    header = f"{'search':<26} {'dict ms':>10} {'compiled ms':>12} {'speedup':>8}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<26} {r.plain.median * 1000:>10.1f} "
+            f"{r.compiled.median * 1000:>12.1f} {r.speedup:>7.2f}x"
+        )
+    return "\n".join(lines)
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import argparse
-import importlib
-import subprocess
+import sys
 from pathlib import Path
 
-from .client import save_day_data
-from .config import ROOT, AOC_YEAR
-from .common import day_dir
+from .config import ROOT
+
+# Modules each subcommand imports on top of aoc.cli. Heavy dependencies
+# (requests, bs4, dotenv, multiprocessing) are only imported by the commands
+# that need them; `aoc startup-profile` reports what this costs.
+COMMAND_IMPORTS: dict[str, tuple[str, ...]] = {
+    "init": ("aoc.client",),
+    "run": ("aoc.runner",),
+    "test": ("subprocess",),
+    "bench": ("aoc.runner", "aoc.bench"),
+    "bench-search": ("aoc.bench", "aoc.search"),
+}
 
 
 def _load_template(name: str) -> str:
@@ -35,6 +43,8 @@ def _ensure_tests_dir() -> Path:
 
 
 def cmd_init_day(args: argparse.Namespace) -> None:
+    from .client import save_day_data
+
     day = args.day
 
     result = save_day_data(day, overwrite=True)
@@ -76,21 +86,32 @@ def cmd_init_day(args: argparse.Namespace) -> None:
 
 
 def cmd_run(args: argparse.Namespace) -> None:
-    day = args.day
-    module_name = f"days.day{day:02d}"
+    from .runner import load_day, parse_days, run_many
 
     try:
-        module = importlib.import_module(module_name)
-    except ModuleNotFoundError as exc:
-        raise SystemExit(f"Could not import {module_name}: {exc}")
+        days = parse_days(args.days)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+    if len(days) == 1 and args.example is None:
+        module = load_day(days[0])
+        if not hasattr(module, "main"):
+            raise SystemExit(f"Module {module.__name__} has no main() function.")
+        module.main()  # type: ignore[call-arg]
+        return
 
-    if not hasattr(module, "main"):
-        raise SystemExit(f"Module {module_name} has no main() function.")
+    from .bench import latest_medians, load_history
 
-    module.main()  # type: ignore[call-arg]
+    input_label = "input" if args.example is None else f"example{args.example}"
+    expected = latest_medians(load_history(), input_label=input_label)
+    runs = run_many(days, workers=args.workers, example=args.example, expected=expected)
+    if any(r.error is not None for r in runs):
+        raise SystemExit(1)
 
 
 def cmd_test(args: argparse.Namespace) -> None:
+    import subprocess
+
     day = args.day
     tests_dir = ROOT / "tests"
     test_path = tests_dir / f"test_day{day:02d}.py"
@@ -103,10 +124,109 @@ def cmd_test(args: argparse.Namespace) -> None:
         raise SystemExit(result.returncode)
 
 
+def cmd_bench(args: argparse.Namespace) -> None:
+    from .runner import available_days
+    from .bench import (
+        append_history,
+        bench_day,
+        find_regressions,
+        format_table,
+        git_commit,
+        latest_medians,
+        load_history,
+        results_to_json,
+        write_json,
+    )
+
+    input_label = "input" if args.example is None else f"example{args.example}"
+    baseline = None
+    if args.compare is not None:
+        base_commit = git_commit(args.compare)
+        if base_commit is None:
+            raise SystemExit(f"Unknown git ref: {args.compare}")
+        baseline = latest_medians(
+            load_history(args.history), input_label=input_label, commit=base_commit
+        )
+        if not baseline:
+            raise SystemExit(
+                f"No benchmark history for {args.compare} ({base_commit[:10]}) "
+                f"on {input_label} with this Python version."
+            )
+
+    days = args.days or available_days()
+    results = []
+    for day in days:
+        try:
+            results.append(
+                bench_day(day, warmup=args.warmup, repeat=args.repeat, example=args.example)
+            )
+        except FileNotFoundError as exc:
+            if args.days:
+                raise SystemExit(f"Day {day:02d}: {exc}")
+            print(f"Skipping day {day:02d}: {exc}", file=sys.stderr)
+
+    print(format_table(results))
+
+    data = results_to_json(
+        results, warmup=args.warmup, repeat=args.repeat, example=args.example
+    )
+    write_json(args.json, data)
+    print(f"Wrote {args.json}")
+
+    if not args.no_history:
+        append_history(results, commit=git_commit(), input_label=input_label, path=args.history)
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, threshold=args.threshold)
+        if regressions:
+            print(f"Regressions vs {args.compare} (threshold +{args.threshold:.0%}):")
+            for reg in regressions:
+                print(
+                    f"  day {reg.day:02d} {reg.stage}: {reg.baseline * 1000:.3f}ms -> "
+                    f"{reg.current * 1000:.3f}ms ({reg.ratio:.2f}x)"
+                )
+            raise SystemExit(1)
+        print(f"No regressions vs {args.compare} (threshold +{args.threshold:.0%}).")
+
+
+def cmd_bench_search(args: argparse.Namespace) -> None:
+    from .bench import bench_search, format_search_table
+
+    results = bench_search(args.size, warmup=args.warmup, repeat=args.repeat)
+    print(f"{args.size}x{args.size} grid graph, median of {args.repeat} runs")
+    print(format_search_table(results))
+
+
+def cmd_startup_profile(args: argparse.Namespace) -> None:
+    from .startup import profile_imports
+
+    commands = args.commands or list(COMMAND_IMPORTS)
+    unknown = [name for name in commands if name not in COMMAND_IMPORTS]
+    if unknown:
+        raise SystemExit(f"Unknown command: {', '.join(unknown)}")
+
+    baseline = profile_imports(())
+    print(
+        f"python: {baseline.total_us / 1000:.1f}ms importing, "
+        f"{baseline.wall_seconds * 1000:.1f}ms process wall time (excluded below)"
+    )
+    for name in commands:
+        profile = profile_imports(("aoc.cli", *COMMAND_IMPORTS[name])).without(baseline)
+        print(
+            f"aoc {name}: {profile.total_us / 1000:.1f}ms importing, "
+            f"{profile.wall_seconds * 1000:.1f}ms process wall time"
+        )
+        for imp in profile.slowest(args.top):
+            print(
+                f"  {imp.cumulative_us / 1000:>8.1f}ms {imp.self_us / 1000:>8.1f}ms  "
+                f"{'  ' * imp.depth}{imp.name}"
+            )
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="aoc",
-        description=f"Advent of Code helper CLI (Python, year {AOC_YEAR}).",
+        description="Advent of Code helper CLI (Python).",
     )
     sub = p.add_subparsers(dest="command", required=True)
 
@@ -119,9 +239,17 @@ def build_parser() -> argparse.ArgumentParser:
 
     sp_run = sub.add_parser(
         "run",
-        help="Run the solution module's main() for a given day.",
+        help="Run the solution module's main() for a day, or several days in parallel.",
+    )
+    sp_run.add_argument("days", help='AoC day (1-25), or a selection like "1-12", "1,3,5" or "all"')
+    sp_run.add_argument(
+        "--workers", type=int, default=None,
+        help="Processes to use when running several days (default: one per CPU)",
+    )
+    sp_run.add_argument(
+        "--example", type=int, default=None, metavar="IDX",
+        help="Solve example IDX instead of the real input",
     )
-    sp_run.add_argument("day", type=int, help="AoC day (1-25)")
     sp_run.set_defaults(func=cmd_run)
 
     sp_test = sub.add_parser(
@@ -131,6 +259,57 @@ def build_parser() -> argparse.ArgumentParser:
     sp_test.add_argument("day", type=int, help="AoC day (1-25)")
     sp_test.set_defaults(func=cmd_test)
 
+    sp_bench = sub.add_parser(
+        "bench",
+        help="Time parse_input, part1 and part2 over repeated runs.",
+    )
+    sp_bench.add_argument("days", type=int, nargs="*", help="AoC days (default: all)")
+    sp_bench.add_argument("--warmup", type=int, default=1, help="Untimed runs per stage")
+    sp_bench.add_argument("--repeat", type=int, default=5, help="Timed runs per stage")
+    sp_bench.add_argument(
+        "--example", type=int, default=None, metavar="IDX",
+        help="Benchmark on example IDX instead of the real input",
+    )
+    sp_bench.add_argument(
+        "--json", type=Path, default=ROOT / "bench_results.json",
+        help="Where to write the machine-readable results",
+    )
+    sp_bench.add_argument(
+        "--history", type=Path, default=ROOT / "bench_history.jsonl",
+        help="JSON lines file that every run is appended to",
+    )
+    sp_bench.add_argument(
+        "--no-history", action="store_true", help="Don't record this run in the history",
+    )
+    sp_bench.add_argument(
+        "--compare", metavar="REF", default=None,
+        help="Fail if a part's median is slower than the run recorded for git REF",
+    )
+    sp_bench.add_argument(
+        "--threshold", type=float, default=0.25,
+        help="Allowed slowdown for --compare as a fraction (default: 0.25)",
+    )
+    sp_bench.set_defaults(func=cmd_bench)
+
+    sp_bench_search = sub.add_parser(
+        "bench-search",
+        help="Compare dict-based bfs/dijkstra with CompiledGraph on a synthetic grid graph.",
+    )
+    sp_bench_search.add_argument("--size", type=int, default=300, help="Grid side length")
+    sp_bench_search.add_argument("--warmup", type=int, default=1, help="Untimed runs per search")
+    sp_bench_search.add_argument("--repeat", type=int, default=5, help="Timed runs per search")
+    sp_bench_search.set_defaults(func=cmd_bench_search)
+
+    sp_profile = sub.add_parser(
+        "startup-profile",
+        help="Report -X importtime breakdowns of each subcommand's imports.",
+    )
+    sp_profile.add_argument(
+        "commands", nargs="*", help=f"Subcommands to profile (default: {', '.join(COMMAND_IMPORTS)})",
+    )
+    sp_profile.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    sp_profile.set_defaults(func=cmd_startup_profile)
+
     return p
 
 
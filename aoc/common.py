@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import mmap
+import re
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from time import perf_counter
-from typing import Any
+from typing import Any, Callable
 
 from .config import INPUTS_DIR
+from .iteration import split_by
 
 
 def day_dir(day: int) -> Path:
@@ -32,6 +37,160 @@ def read_example(day: int, idx: int = 1) -> str:
     return read_text(example_path(day, idx))
 
 
+def read_bytes(path: Path) -> bytes | mmap.mmap:
+    """Map a file read-only into memory (b"" for an empty file, which can't be mapped).
+
+    The mapping stays valid after the file is closed and is paged in on
+    demand, so nothing is copied up front.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_input_bytes(day: int, *, example: int | None = None) -> bytes | mmap.mmap:
+    return read_bytes(input_path(day) if example is None else example_path(day, example))
+
+
+# A '-' is a sign only when it doesn't follow a digit, so "3-5" is 3 and 5.
+_INT_RE = re.compile(rb"(?<![0-9])-?[0-9]+")
+
+# Below this many bytes ints() uses the regex: importing NumPy costs more
+# than the vectorized scan saves.
+INTS_NUMPY_MIN_BYTES = 1 << 20
+
+
+def ints(buf: bytes | bytearray | memoryview | mmap.mmap | str) -> array:
+    """Every integer in buf, in order, as an array('q').
+
+    A '-' directly before the digits makes the number negative unless the '-'
+    itself follows a digit (so ranges like "3-5" give 3 and 5). Buffers of at
+    least INTS_NUMPY_MIN_BYTES are scanned by NumPy (if installed) in one
+    vectorized pass with no per-number objects; smaller ones use a bytes regex.
+    Raises OverflowError if a number doesn't fit in 64 bits.
+    """
+    if isinstance(buf, str):
+        buf = buf.encode("ascii")
+    if len(buf) >= INTS_NUMPY_MIN_BYTES:
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            out = _ints_numpy(numpy, buf)
+            if out is not None:
+                return out
+    return array("q", map(int, _INT_RE.findall(buf)))
+
+
+def _ints_numpy(np: Any, buf: bytes | bytearray | memoryview | mmap.mmap) -> array | None:
+    """The vectorized scan behind ints(); None if a number might not fit in int64."""
+    out = array("q")
+    data = np.frombuffer(buf, dtype=np.uint8)
+    digit = data - np.uint8(48)  # wraps around for bytes below '0'
+    is_digit = digit < 10
+    if not is_digit.any():
+        return out
+
+    before = np.zeros_like(is_digit)
+    before[1:] = is_digit[:-1]
+    after = np.zeros_like(is_digit)
+    after[:-1] = is_digit[1:]
+    starts = np.flatnonzero(is_digit & ~before)
+    lengths = np.flatnonzero(is_digit & ~after) + 1 - starts
+    if lengths.max() > 18:
+        return None  # could wrap around; let the exact regex path decide
+
+    # Horner's rule, one digit position of every number per step.
+    values = digit[starts].astype(np.int64)
+    last = len(digit) - 1
+    for k in range(1, int(lengths.max())):
+        nxt = digit[np.minimum(starts + k, last)]
+        values = np.where(lengths > k, values * 10 + nxt, values)
+
+    # A '-' right before the digits is a sign, unless it follows a digit itself.
+    minus = np.zeros(len(starts), dtype=bool)
+    signed = starts >= 1
+    minus[signed] = data[starts[signed] - 1] == ord("-")
+    after_digit = starts >= 2
+    minus[after_digit] &= ~is_digit[starts[after_digit] - 2]
+    values[minus] *= -1
+
+    out.frombytes(values.astype("=i8").tobytes())
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Streaming input
+# ---------------------------------------------------------------------------
+
+def buffer_lines(buf: bytes | bytearray | mmap.mmap) -> Iterator[bytes]:
+    """Yield the lines of a bytes-like buffer (without line endings)."""
+    pos, size = 0, len(buf)
+    while pos < size:
+        end = buf.find(b"\n", pos)
+        if end < 0:
+            end = size
+        yield buf[pos:end]
+        pos = end + 1
+
+
+def iter_lines(
+    source: str | Path | bytes | bytearray | mmap.mmap,
+    *,
+    use_mmap: bool = False,
+) -> Iterator[str]:
+    """Yield the lines of a file or buffer one at a time, without line endings.
+
+    A path is read through the file's own buffering (use_mmap=True maps it
+    instead), so memory stays constant however large the file is.
+    """
+    if not isinstance(source, (str, Path)):
+        for line in buffer_lines(source):
+            yield line.decode("utf-8").rstrip("\r")
+        return
+
+    if not use_mmap:
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip("\r\n")
+        return
+
+    buf = read_bytes(Path(source))
+    try:
+        yield from iter_lines(buf)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def stream_input(
+    day: int,
+    parser: Callable[[Any], Any] | None = None,
+    *,
+    blocks: bool = False,
+    example: int | None = None,
+    use_mmap: bool = False,
+) -> Iterator[Any]:
+    """Lazily yield parsed records from a day's input (or example) file.
+
+    By default every non-blank line is a record: parser(line) is yielded.
+    blocks=True yields parser(lines) for each blank-line separated block
+    instead, where lines is a list[str] as split_by(lines, "") gives them.
+    Without a parser the lines (or blocks) are yielded as they are. Only the
+    current record is held in memory.
+    """
+    path = input_path(day) if example is None else example_path(day, example)
+    lines = iter_lines(path, use_mmap=use_mmap)
+    records: Iterator[Any] = (
+        split_by(lines, "") if blocks else (line for line in lines if line)
+    )
+    if parser is None:
+        return records
+    return map(parser, records)
+
+
 @dataclass
 class TimingResult:
     value: Any
@@ -2,20 +2,45 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-
-from dotenv import load_dotenv
-
-load_dotenv()
+from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
 INPUTS_DIR = ROOT / "inputs"
 QUESTIONS_DIR = ROOT / "questions"
 
-# One year per repo. Set this in .env.
-AOC_YEAR = int(os.getenv("AOC_YEAR", "2023"))
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load .env into the environment (once).
+
+    Deferred until a setting is actually needed, so importing aoc stays cheap.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def get_year() -> int:
+    # One year per repo. Set this in .env.
+    load_env()
+    return int(os.getenv("AOC_YEAR", "2023"))
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from aoc.config import AOC_YEAR` working without loading .env on import.
+    if name == "AOC_YEAR":
+        return get_year()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_session_cookie() -> str:
+    load_env()
     token = os.getenv("AOC_SESSION")
     if not token:
         raise RuntimeError(
@@ -26,6 +51,7 @@ def get_session_cookie() -> str:
 
 
 def get_user_agent() -> str:
+    load_env()
     return os.getenv(
         "AOC_USER_AGENT",
         "github.com/yourname/aoc-python (Advent of Code helper script)",
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 import sys
-from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence, TypeVar
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterable, Iterator, Mapping, Sequence, TypeVar, cast
+
+from .search import CostResult, SearchResult, Weight, bfs, dijkstra
+
+if TYPE_CHECKING:
+    import numpy as np
 
 T = TypeVar("T")
 Pos = tuple[int, int]
@@ -243,6 +251,827 @@ def dict_to_grid(
     return grid
 
 
+# ---------------------------------------------------------------------------
+# Flood fill and coordinate compression
+# ---------------------------------------------------------------------------
+
+def flood_fill(
+    grid: Sequence[Sequence[T]],
+    starts: Iterable[Pos],
+    passable: Callable[[Pos, T], bool] | None = None,
+    *,
+    dirs: Sequence[Pos] = DIR4,
+) -> set[Pos]:
+    """Positions reachable from starts through passable cells (starts included).
+
+    passable(pos, value) defaults to "every cell"; moves stay inside the grid.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    seen: set[Pos] = set(starts)
+    q: deque[Pos] = deque(seen)
+    while q:
+        r, c = q.popleft()
+        for dr, dc in dirs:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in seen:
+                if passable is None or passable((nr, nc), grid[nr][nc]):
+                    seen.add((nr, nc))
+                    q.append((nr, nc))
+    return seen
+
+
+def flood_fill_flat(
+    blocked: bytes | bytearray,
+    width: int,
+    starts: Iterable[int],
+    *,
+    dirs: Sequence[Pos] = DIR4,
+) -> bytearray:
+    """flood_fill over a flat row-major mask: cell (r, c) is index r * width + c.
+
+    Cells where blocked is non-zero are walls. Returns a bytearray of the same
+    length with 1 for every reached cell (starts included). Avoids building
+    tuples and sets, which matters on large compressed grids.
+    """
+    size = len(blocked)
+    seen = bytearray(size)
+    stack: list[int] = []
+    for k in starts:
+        if not seen[k]:
+            seen[k] = 1
+            stack.append(k)
+    if sorted(dirs) == sorted(DIR4):  # the common case, unrolled
+        last = width - 1
+        while stack:
+            k = stack.pop()
+            c = k % width
+            for nk in (
+                k - width,
+                k + width if k + width < size else -1,
+                k - 1 if c else -1,
+                k + 1 if c < last else -1,
+            ):
+                if nk >= 0 and not seen[nk] and not blocked[nk]:
+                    seen[nk] = 1
+                    stack.append(nk)
+        return seen
+
+    # With the column kept in range, nk is in range exactly when the row is.
+    steps = [(dc, dr * width + dc) for dr, dc in dirs]
+    while stack:
+        k = stack.pop()
+        c = k % width
+        for dc, step in steps:
+            nk = k + step
+            if 0 <= nk < size and 0 <= c + dc < width and not seen[nk] and not blocked[nk]:
+                seen[nk] = 1
+                stack.append(nk)
+    return seen
+
+
+@dataclass
+class CompressedAxis:
+    """One compressed axis: band i covers original values starts[i] .. starts[i + 1] - 1."""
+    starts: list[int]
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def index(self, value: int) -> int:
+        """Band containing value; raises IndexError outside the compressed range."""
+        i = bisect_right(self.starts, value) - 1
+        if not 0 <= i < len(self):
+            raise IndexError(f"{value} is outside the compressed range")
+        return i
+
+    def value(self, i: int) -> int:
+        """First original value of band i."""
+        return self.starts[i]
+
+    def length(self, i: int) -> int:
+        """Number of original values in band i."""
+        return self.starts[i + 1] - self.starts[i]
+
+    def span(self, first: int, last: int) -> int:
+        """Number of original values in bands first..last (inclusive)."""
+        return self.starts[last + 1] - self.starts[first]
+
+
+def compress_axis(values: Iterable[int], *, gaps: bool = True, pad: bool = False) -> CompressedAxis:
+    """Compress the distinct values of one axis into bands.
+
+    gaps=True gives every value its own 1-wide band and turns the space between
+    two neighbouring values into one gap band; with gaps=False each value's
+    band runs up to the next value. pad=True adds a 1-wide band on both ends,
+    so a flood fill can start outside everything.
+    """
+    points = set(values)
+    if not points:
+        return CompressedAxis([0])
+    if gaps:
+        points |= {v + 1 for v in points}
+    else:
+        points.add(max(points) + 1)
+    if pad:
+        points |= {min(points) - 1, max(points) + 1}
+    return CompressedAxis(sorted(points))
+
+
+@dataclass
+class CompressedCoords:
+    """A grid over compressed (row, col) bands, mapping back to original units.
+
+    Compressed cell (i, j) stands for the rectangle of original cells
+    rows.value(i) .. + rows.length(i) by cols.value(j) .. + cols.length(j).
+    """
+    rows: CompressedAxis
+    cols: CompressedAxis
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rows), len(self.cols)
+
+    def index(self, pos: Pos) -> Pos:
+        """Compressed cell containing an original position."""
+        return self.rows.index(pos[0]), self.cols.index(pos[1])
+
+    def pos(self, cell: Pos) -> Pos:
+        """Original top-left position of a compressed cell."""
+        return self.rows.value(cell[0]), self.cols.value(cell[1])
+
+    def area(self, cell: Pos) -> int:
+        """Number of original cells a compressed cell stands for."""
+        return self.rows.length(cell[0]) * self.cols.length(cell[1])
+
+    def total_area(self, cells: Iterable[Pos]) -> int:
+        return sum(self.area(cell) for cell in cells)
+
+    def grid(self, fill: T) -> list[list[T]]:
+        """A dense compressed grid (works with print_grid, flood_fill, ...)."""
+        height, width = self.shape
+        return [[fill] * width for _ in range(height)]
+
+    def draw_line(self, grid: list[list[T]], a: Pos, b: Pos, value: T) -> None:
+        """Set the compressed cells covering the axis-aligned segment a-b (inclusive)."""
+        if a[0] != b[0] and a[1] != b[1]:
+            raise ValueError(f"Segment {a} -> {b} is not axis-aligned")
+        (i1, j1), (i2, j2) = self.index(a), self.index(b)
+        for i in range(min(i1, i2), max(i1, i2) + 1):
+            row = grid[i]
+            for j in range(min(j1, j2), max(j1, j2) + 1):
+                row[j] = value
+
+
+def compress_coords(
+    positions: Iterable[Pos],
+    *,
+    gaps: bool = True,
+    pad: bool = False,
+) -> CompressedCoords:
+    """Compress the rows and columns used by positions (see compress_axis)."""
+    positions = list(positions)
+    return CompressedCoords(
+        rows=compress_axis((r for r, _ in positions), gaps=gaps, pad=pad),
+        cols=compress_axis((c for _, c in positions), gaps=gaps, pad=pad),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Sparse chunked grid
+# ---------------------------------------------------------------------------
+
+class SparseGrid(Generic[T]):
+    """An unbounded grid stored in fixed-size square tiles allocated on demand.
+
+    Cells equal to `default` count as empty. Access is O(1): one dict lookup
+    for the tile, one list index inside it. Memory follows the occupied area
+    rather than the bounding box, so huge or negative coordinates are fine.
+    The bounding box is kept up to date as cells are set; clearing cells
+    marks it stale, and it is recomputed on the next query.
+    """
+
+    def __init__(self, default: T = ".", *, tile_bits: int = 5) -> None:  # type: ignore[assignment]
+        self.default = default
+        self.tile_bits = tile_bits
+        self.tile_size = 1 << tile_bits
+        self._mask = self.tile_size - 1
+        self._tiles: dict[Pos, list[T]] = {}
+        self._counts: dict[Pos, int] = {}
+        self._len = 0
+        self._bbox: list[int] | None = None  # [min_r, min_c, max_r, max_c]
+        self._bbox_stale = False
+
+    @classmethod
+    def from_dict(
+        cls,
+        mapping: Mapping[Pos, T],
+        default: T = ".",  # type: ignore[assignment]
+        *,
+        tile_bits: int = 5,
+    ) -> SparseGrid[T]:
+        grid: SparseGrid[T] = cls(default, tile_bits=tile_bits)
+        for pos, value in mapping.items():
+            grid[pos] = value
+        return grid
+
+    def _locate(self, pos: Pos) -> tuple[Pos, int]:
+        r, c = pos
+        bits, mask = self.tile_bits, self._mask
+        return (r >> bits, c >> bits), ((r & mask) << bits) | (c & mask)
+
+    def __getitem__(self, pos: Pos) -> T:
+        key, i = self._locate(pos)
+        tile = self._tiles.get(key)
+        return self.default if tile is None else tile[i]
+
+    def get(self, pos: Pos, default: T | None = None) -> T | None:
+        value = self[pos]
+        return default if value == self.default else value
+
+    def __setitem__(self, pos: Pos, value: T) -> None:
+        key, i = self._locate(pos)
+        tile = self._tiles.get(key)
+        if tile is None:
+            if value == self.default:
+                return
+            tile = self._tiles[key] = [self.default] * (self.tile_size * self.tile_size)
+            self._counts[key] = 0
+        was_empty = tile[i] == self.default
+        is_empty = value == self.default
+        tile[i] = value
+        if was_empty and not is_empty:
+            self._counts[key] += 1
+            self._len += 1
+            self._grow_bbox(pos)
+        elif is_empty and not was_empty:
+            self._counts[key] -= 1
+            self._len -= 1
+            if not self._counts[key]:
+                del self._tiles[key], self._counts[key]
+            self._bbox_stale = True
+
+    def __delitem__(self, pos: Pos) -> None:
+        if pos not in self:
+            raise KeyError(pos)
+        self[pos] = self.default
+
+    def __contains__(self, pos: object) -> bool:
+        return self[pos] != self.default  # type: ignore[index]
+
+    def __len__(self) -> int:
+        """Number of non-empty cells."""
+        return self._len
+
+    def _grow_bbox(self, pos: Pos) -> None:
+        r, c = pos
+        box = self._bbox
+        if box is None:
+            if not self._bbox_stale:
+                self._bbox = [r, c, r, c]
+            return
+        if r < box[0]: box[0] = r
+        if c < box[1]: box[1] = c
+        if r > box[2]: box[2] = r
+        if c > box[3]: box[3] = c
+
+    def bbox(self) -> tuple[int, int, int, int] | None:
+        """(min_r, min_c, max_r, max_c) of the non-empty cells, or None if empty."""
+        if self._bbox_stale:
+            self._bbox = None
+            self._bbox_stale = False
+            for pos, _ in self.items():
+                self._grow_bbox(pos)
+        return None if self._bbox is None else cast(tuple[int, int, int, int], tuple(self._bbox))
+
+    def items(self) -> Iterator[tuple[Pos, T]]:
+        """Yield ((row, col), value) for every non-empty cell, tile by tile."""
+        for key in list(self._tiles):
+            yield from self._tile_items(key, None)
+
+    def _tile_items(
+        self,
+        key: Pos,
+        box: tuple[int, int, int, int] | None,
+    ) -> Iterator[tuple[Pos, T]]:
+        tile = self._tiles[key]
+        bits, size, default = self.tile_bits, self.tile_size, self.default
+        r0, c0 = key[0] << bits, key[1] << bits
+        for i, value in enumerate(tile):
+            if value == default:
+                continue
+            r, c = r0 + i // size, c0 + (i & self._mask)
+            if box is None or (box[0] <= r <= box[2] and box[1] <= c <= box[3]):
+                yield (r, c), value
+
+    def region(self, min_r: int, min_c: int, max_r: int, max_c: int) -> Iterator[tuple[Pos, T]]:
+        """Yield the non-empty cells inside the inclusive rectangle.
+
+        Only tiles overlapping the rectangle are visited, so this is cheap
+        even when the grid holds far more cells than the region.
+        """
+        bits = self.tile_bits
+        box = (min_r, min_c, max_r, max_c)
+        tr0, tc0, tr1, tc1 = min_r >> bits, min_c >> bits, max_r >> bits, max_c >> bits
+        if (tr1 - tr0 + 1) * (tc1 - tc0 + 1) <= len(self._tiles):
+            keys = [
+                (tr, tc)
+                for tr in range(tr0, tr1 + 1)
+                for tc in range(tc0, tc1 + 1)
+                if (tr, tc) in self._tiles
+            ]
+        else:
+            keys = sorted(
+                k for k in self._tiles if tr0 <= k[0] <= tr1 and tc0 <= k[1] <= tc1
+            )
+        for key in keys:
+            yield from self._tile_items(key, box)
+
+    def viewport(
+        self,
+        top_left: Pos,
+        bottom_right: Pos,
+    ) -> list[list[T]]:
+        """Dense list-of-lists copy of the inclusive rectangle (for the printers)."""
+        (min_r, min_c), (max_r, max_c) = top_left, bottom_right
+        rows = [[self.default] * (max_c - min_c + 1) for _ in range(max_r - min_r + 1)]
+        for (r, c), value in self.region(min_r, min_c, max_r, max_c):
+            rows[r - min_r][c - min_c] = value
+        return rows
+
+    def render(
+        self,
+        top_left: Pos | None = None,
+        bottom_right: Pos | None = None,
+        *,
+        sep: str = "",
+        cell_to_str: Callable[[T], str] = str,
+    ) -> str:
+        """Draw only the requested viewport (default: the bounding box)."""
+        box = self.bbox()
+        if top_left is None or bottom_right is None:
+            if box is None:
+                return ""
+            top_left = top_left or (box[0], box[1])
+            bottom_right = bottom_right or (box[2], box[3])
+        return format_grid(
+            self.viewport(top_left, bottom_right), sep=sep, cell_to_str=cell_to_str
+        )
+
+
+# ---------------------------------------------------------------------------
+# Flat-indexed grid for searches
+# ---------------------------------------------------------------------------
+
+class FlatGrid(Generic[T]):
+    """A grid flattened to one list, with cells addressed by int index r * width + c.
+
+    The grid is padded with add_border first, so every real cell has all its
+    neighbours inside the list and a move is just adding a precomputed
+    offset: no (row, col) tuples, no bounds checks. Indices are plain ints in
+    range(len(grid)), which lets bfs/dijkstra use their dense, list-backed
+    storage (state_bound=len(grid)) instead of dicts keyed by tuples.
+
+    Positions passed in and out (index/pos) are in the original, unpadded
+    coordinates.
+    """
+
+    def __init__(
+        self,
+        grid: Sequence[Sequence[T]],
+        *,
+        border: T = "#",  # type: ignore[assignment]
+        dirs: Sequence[Pos] = DIR4,
+    ) -> None:
+        padded = add_border([list(row) for row in grid], border)
+        self.height = len(padded)
+        self.width = len(padded[0]) if padded else 0
+        self.cells: list[T] = [cell for row in padded for cell in row]
+        self.border = border
+        self.dirs = tuple(dirs)
+        self.offsets = tuple(dr * self.width + dc for dr, dc in self.dirs)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, i: int) -> T:
+        return self.cells[i]
+
+    def __setitem__(self, i: int, value: T) -> None:
+        self.cells[i] = value
+
+    def index(self, pos: Pos) -> int:
+        r, c = pos
+        return (r + 1) * self.width + c + 1
+
+    def pos(self, i: int) -> Pos:
+        r, c = divmod(i, self.width)
+        return r - 1, c - 1
+
+    def is_border(self, i: int) -> bool:
+        r, c = divmod(i, self.width)
+        return r == 0 or c == 0 or r == self.height - 1 or c == self.width - 1
+
+    def find_all(self, value: T) -> list[int]:
+        return [i for i, v in enumerate(self.cells) if v == value and not self.is_border(i)]
+
+    def find_first(self, value: T) -> int | None:
+        for i, v in enumerate(self.cells):
+            if v == value and not self.is_border(i):
+                return i
+        return None
+
+    def open_mask(self, passable: Callable[[T], bool] | None = None) -> bytearray:
+        """One byte per index: 1 if the cell can be entered, 0 for walls and padding.
+
+        passable(value) decides which cells can be entered; by default every
+        cell except the padding.
+        """
+        if passable is None:
+            mask = bytearray(b"\x01") * len(self.cells)
+        else:
+            mask = bytearray(map(passable, self.cells))
+        w, h = self.width, self.height
+        if w and h:
+            mask[:w] = bytes(w)
+            mask[-w:] = bytes(w)
+            mask[::w] = bytes(h)
+            mask[w - 1 :: w] = bytes(h)
+        return mask
+
+    def neighbors(
+        self,
+        passable: Callable[[T], bool] | None = None,
+    ) -> Callable[[int], list[int]]:
+        """A neighbors(i) callable for bfs/dfs over the open cells."""
+        ok = self.open_mask(passable)
+        offsets = self.offsets
+
+        def _neighbors(i: int) -> list[int]:
+            return [i + off for off in offsets if ok[i + off]]
+
+        return _neighbors
+
+    def weighted_neighbors(
+        self,
+        cost: Callable[[T], Weight],
+        passable: Callable[[T], bool] | None = None,
+    ) -> Callable[[int], list[tuple[int, Weight]]]:
+        """A neighbors(i) callable for dijkstra: entering cell j costs cost(value of j)."""
+        ok = self.open_mask(passable)
+        costs = [cost(v) if ok[i] else 0 for i, v in enumerate(self.cells)]
+        offsets = self.offsets
+
+        def _neighbors(i: int) -> list[tuple[int, Weight]]:
+            return [(i + off, costs[i + off]) for off in offsets if ok[i + off]]
+
+        return _neighbors
+
+    def bfs(
+        self,
+        starts: Iterable[Pos],
+        passable: Callable[[T], bool] | None = None,
+        is_goal: Callable[[int], bool] | None = None,
+        *,
+        track_parents: bool = True,
+    ) -> SearchResult[int] | CostResult[int]:
+        """bfs over flat indices; starts are (row, col), results are indices.
+
+        Starts are expanded even if they are not passable themselves.
+        """
+        return bfs(
+            [self.index(p) for p in starts],
+            self.neighbors(passable),
+            is_goal,
+            track_parents=track_parents,
+            state_bound=len(self),
+        )
+
+    def dijkstra(
+        self,
+        starts: Iterable[Pos],
+        cost: Callable[[T], Weight],
+        passable: Callable[[T], bool] | None = None,
+        is_goal: Callable[[int], bool] | None = None,
+        *,
+        track_parents: bool = True,
+    ) -> SearchResult[int] | CostResult[int]:
+        """dijkstra over flat indices; starts are (row, col), results are indices."""
+        return dijkstra(
+            [self.index(p) for p in starts],
+            self.weighted_neighbors(cost, passable),
+            is_goal,
+            track_parents=track_parents,
+            state_bound=len(self),
+        )
+
+    def path_positions(self, path: Iterable[int]) -> list[Pos]:
+        """Convert a path of indices (e.g. from path_to) back to (row, col)."""
+        return [self.pos(i) for i in path]
+
+
+# ---------------------------------------------------------------------------
+# Dense NumPy grid
+# ---------------------------------------------------------------------------
+
+def _numpy():
+    """Import NumPy on first use, so importing aoc.grid stays cheap."""
+    import numpy
+
+    return numpy
+
+
+def count_neighbors(mask: np.ndarray, dirs: Sequence[Pos] = DIR8) -> np.ndarray:
+    """For every cell, count the neighbours in `dirs` for which mask is true.
+
+    Equivalent to convolving mask with a kernel that has a 1 at each
+    direction; cells outside the array count as false.
+    """
+    np = _numpy()
+    mask = np.asarray(mask, dtype=np.uint8)
+    rows, cols = mask.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = mask
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr, dc in dirs:
+        counts += padded[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols]
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Cellular automata on boolean masks
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Simulation:
+    """Outcome of run_automaton / peel.
+
+    state: the final boolean mask.
+    steps: number of steps that changed something.
+    changed: number of cells changed by each of those steps.
+    """
+    state: np.ndarray
+    steps: int = 0
+    changed: list[int] = field(default_factory=list)
+
+    @property
+    def total_changed(self) -> int:
+        return sum(self.changed)
+
+
+def step_automaton(
+    state: np.ndarray,
+    rule: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    dirs: Sequence[Pos] = DIR8,
+) -> np.ndarray:
+    """Apply rule(state, neighbour_counts) -> new state to every cell at once."""
+    np = _numpy()
+    return np.asarray(rule(state, count_neighbors(state, dirs)), dtype=bool)
+
+
+def run_automaton(
+    state: np.ndarray,
+    rule: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    *,
+    dirs: Sequence[Pos] = DIR8,
+    max_steps: int | None = None,
+) -> Simulation:
+    """Step a synchronous automaton until it stops changing (or max_steps).
+
+    Every step recomputes all neighbour counts, so this suits rules where
+    cells can both appear and disappear, e.g. Game of Life:
+        run_automaton(alive, lambda a, n: (n == 3) | (a & (n == 2)), max_steps=100)
+    """
+    np = _numpy()
+    state = np.asarray(state, dtype=bool)
+    sim = Simulation(state)
+    while max_steps is None or sim.steps < max_steps:
+        new = step_automaton(state, rule, dirs)
+        changed = int((new != state).sum())
+        if not changed:
+            break
+        state = new
+        sim.steps += 1
+        sim.changed.append(changed)
+    sim.state = state
+    return sim
+
+
+def peel(
+    state: np.ndarray,
+    remove_if: Callable[[Any], Any],
+    *,
+    dirs: Sequence[Pos] = DIR8,
+) -> Simulation:
+    """Repeatedly remove cells whose live-neighbour count satisfies remove_if.
+
+    Removal happens in synchronous waves, like run_automaton with the rule
+    "stay alive unless remove_if(count)", but after the first (vectorized)
+    wave only the neighbours of just-removed cells are re-examined, so the
+    work is proportional to the number of removals rather than passes x cells.
+    remove_if is called with a NumPy array once, then with single ints, so
+    use a plain comparison like `lambda n: n < 4`.
+    """
+    np = _numpy()
+    state = np.asarray(state, dtype=bool)
+    rows, cols = state.shape
+    counts = count_neighbors(state, dirs)
+    first = state & np.asarray(remove_if(counts), dtype=bool)
+
+    # Work on flat indices into the grid padded by one cell, so neighbours
+    # are fixed offsets and never out of bounds.
+    width = cols + 2
+    offsets = [dr * width + dc for dr, dc in dirs]
+    alive_grid = np.zeros((rows + 2, width), dtype=bool)
+    alive_grid[1:-1, 1:-1] = state
+    count_grid = np.zeros((rows + 2, width), dtype=np.int64)
+    count_grid[1:-1, 1:-1] = counts
+    alive = alive_grid.ravel().tolist()
+    count = count_grid.ravel().tolist()
+    rr, cc = np.nonzero(first)
+    wave = ((rr + 1) * width + cc + 1).tolist()
+
+    sim = Simulation(state)
+    while wave:
+        sim.steps += 1
+        sim.changed.append(len(wave))
+        for i in wave:
+            alive[i] = False
+        touched: set[int] = set()
+        for i in wave:
+            for off in offsets:
+                j = i + off
+                if alive[j]:
+                    count[j] -= 1
+                    touched.add(j)
+        wave = [j for j in touched if remove_if(count[j])]
+
+    sim.state = np.array(alive, dtype=bool).reshape(rows + 2, width)[1:-1, 1:-1]
+    return sim
+
+
+class Grid:
+    """A dense character grid stored as a 2-D uint8 NumPy array, one byte per cell.
+
+    Cells are read and written as 1-character strings by (row, col), while
+    `cells` exposes the array for vectorized work. A Grid also behaves as a
+    sequence of rows (lists of characters), so the list-of-lists helpers
+    (iter_grid, print_grid, add_border, ...) accept it too.
+    """
+
+    __slots__ = ("cells",)
+
+    def __init__(self, cells: np.ndarray) -> None:
+        if cells.ndim != 2:
+            raise ValueError(f"Grid needs a 2-D array, got shape {cells.shape}")
+        self.cells = cells
+
+    @classmethod
+    def from_bytes(cls, buf: bytes | bytearray | memoryview) -> Grid:
+        """Wrap raw input bytes without copying them.
+
+        The cells are a strided view over buf that skips the line endings
+        (\\n or \\r\\n, whichever the first line uses), so every line must
+        have the same width. Trailing newlines are ignored. The view is
+        writable when buf is mutable (a bytearray) and read-only for bytes.
+        """
+        np = _numpy()
+        data = np.frombuffer(buf, dtype=np.uint8)
+        end = len(data)
+        while end and data[end - 1] in (10, 13):
+            end -= 1
+        data = data[:end]
+        if not end:
+            return cls(np.zeros((0, 0), dtype=np.uint8))
+
+        newlines = np.flatnonzero(data == 10)
+        width = int(newlines[0]) if len(newlines) else end
+        eol = 1
+        if len(newlines) and width and data[width - 1] == 13:
+            width -= 1
+            eol = 2
+        stride = width + eol
+        rows = len(newlines) + 1
+        if (
+            rows * stride - eol != end
+            or not np.all(newlines == np.arange(width + eol - 1, end, stride))
+            or (eol == 2 and not np.all(data[newlines - 1] == 13))
+        ):
+            raise ValueError("All lines of a Grid must have the same length and line ending")
+        cells = np.lib.stride_tricks.as_strided(
+            data, shape=(rows, width), strides=(stride, 1), writeable=data.flags.writeable
+        )
+        return cls(cells)
+
+    @classmethod
+    def from_text(cls, raw: str) -> Grid:
+        """Parse a multiline string (one ASCII character per cell)."""
+        return cls.from_bytes(raw.encode("ascii"))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[str]]) -> Grid:
+        """Convert a list-of-lists grid (e.g. from parse_char_grid or add_border)."""
+        np = _numpy()
+        if not rows:
+            return cls(np.zeros((0, 0), dtype=np.uint8))
+        data = np.frombuffer("".join("".join(row) for row in rows).encode("ascii"), dtype=np.uint8)
+        return cls(data.reshape(len(rows), -1).copy())
+
+    @classmethod
+    def full(cls, height: int, width: int, fill: str = ".") -> Grid:
+        np = _numpy()
+        return cls(np.full((height, width), ord(fill), dtype=np.uint8))
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator[list[str]]:
+        for row in self.cells:
+            yield list(row.tobytes().decode("ascii"))
+
+    def __getitem__(self, key):
+        """grid[r, c] -> character; grid[r] -> row as a list;
+        grid[r0:r1, c0:c1] -> a Grid view sharing the same cells."""
+        if isinstance(key, tuple):
+            r, c = key
+            if isinstance(r, slice) or isinstance(c, slice):
+                return Grid(self.cells[key])
+            return chr(self.cells[r, c])
+        if isinstance(key, slice):
+            return Grid(self.cells[key])
+        return list(self.cells[key].tobytes().decode("ascii"))
+
+    def __setitem__(self, pos: Pos, value: str) -> None:
+        if not self.cells.flags.writeable:
+            self.cells = self.cells.copy()
+        self.cells[pos] = ord(value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.shape == other.shape and bool((self.cells == other.cells).all())
+
+    def __str__(self) -> str:
+        return "\n".join(row.tobytes().decode("ascii") for row in self.cells)
+
+    def __repr__(self) -> str:
+        return f"Grid({self.height}x{self.width})"
+
+    def copy(self) -> Grid:
+        return Grid(self.cells.copy())
+
+    def in_bounds(self, pos: Pos) -> bool:
+        r, c = pos
+        return 0 <= r < self.height and 0 <= c < self.width
+
+    def mask(self, chars: str) -> np.ndarray:
+        """Boolean array, true where the cell is one of `chars`."""
+        np = _numpy()
+        if len(chars) == 1:
+            return self.cells == ord(chars)
+        return np.isin(self.cells, np.frombuffer(chars.encode("ascii"), dtype=np.uint8))
+
+    def count(self, chars: str) -> int:
+        return int(self.mask(chars).sum())
+
+    def find_all(self, chars: str) -> list[Pos]:
+        """Positions of every cell that is one of `chars`, in row-major order."""
+        np = _numpy()
+        return [(int(r), int(c)) for r, c in np.argwhere(self.mask(chars))]
+
+    def find_first(self, chars: str) -> Pos | None:
+        np = _numpy()
+        hits = np.flatnonzero(self.mask(chars))
+        if not len(hits):
+            return None
+        return divmod(int(hits[0]), self.width)
+
+    def neighbor_counts(self, chars: str, dirs: Sequence[Pos] = DIR8) -> np.ndarray:
+        """For every cell, how many of its neighbours in `dirs` are one of `chars`."""
+        return count_neighbors(self.mask(chars), dirs)
+
+    def with_border(self, border: str = ".", border_width: int = 1) -> Grid:
+        """Like add_border, but returns a Grid."""
+        np = _numpy()
+        if border_width < 0: raise ValueError("border_width must be >= 0")
+        return Grid(np.pad(self.cells, border_width, constant_values=ord(border)))
+
+    def to_rows(self) -> list[list[str]]:
+        return list(self)
+
+
 # ---------------------------------------------------------------------------
 # Printing a grid
 # ---------------------------------------------------------------------------
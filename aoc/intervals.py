@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+
+# Intervals are half-open: (start, stop) holds start <= x < stop, like range.
+
+Interval = tuple[int, int]
+
+
+def normalize(intervals: Iterable[Interval | range]) -> list[Interval]:
+    """Sort intervals and merge the overlapping or adjacent ones (empty ones are dropped)."""
+    pairs = sorted(
+        (r.start, r.stop) if isinstance(r, range) else (r[0], r[1]) for r in intervals
+    )
+    merged: list[list[int]] = []
+    for start, stop in pairs:
+        if start >= stop:
+            continue
+        if merged and start <= merged[-1][1]:
+            if stop > merged[-1][1]:
+                merged[-1][1] = stop
+        else:
+            merged.append([start, stop])
+    return [(a, b) for a, b in merged]
+
+
+class IntervalSet:
+    """A set of integers stored as sorted, disjoint, non-adjacent half-open intervals.
+
+    Building normalizes in O(n log n); membership is a bisect, O(log n).
+    Accepts (start, stop) pairs or range objects (step 1).
+    """
+
+    __slots__ = ("starts", "stops")
+
+    def __init__(self, intervals: Iterable[Interval | range] = ()) -> None:
+        merged = normalize(intervals)
+        self.starts = [a for a, _ in merged]
+        self.stops = [b for _, b in merged]
+
+    @classmethod
+    def from_inclusive(cls, pairs: Iterable[tuple[int, int]]) -> IntervalSet:
+        """Build from inclusive (first, last) pairs, as puzzle inputs usually give them."""
+        return cls((a, b + 1) for a, b in pairs)
+
+    @classmethod
+    def _from_normalized(cls, merged: list[Interval]) -> IntervalSet:
+        result = cls()
+        result.starts = [a for a, _ in merged]
+        result.stops = [b for _, b in merged]
+        return result
+
+    def __contains__(self, x: object) -> bool:
+        if not isinstance(x, int):
+            return False
+        i = bisect_right(self.starts, x) - 1
+        return i >= 0 and x < self.stops[i]
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self.starts, self.stops)
+
+    def __len__(self) -> int:
+        """Number of intervals (see total_length for the number of integers)."""
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.stops == other.stops
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)!r})"
+
+    def total_length(self) -> int:
+        """Number of integers in the set."""
+        return sum(self.stops) - sum(self.starts)
+
+    # -- bulk queries -------------------------------------------------------
+
+    def members(self, values: Iterable[int]) -> Iterator[int]:
+        """Yield the values that are in the set, in sorted order.
+
+        Sorting the values once and sweeping them alongside the intervals
+        costs O((m + n) + m log m) instead of m bisects.
+        """
+        starts, stops = self.starts, self.stops
+        i, n = 0, len(starts)
+        for x in sorted(values):
+            while i < n and stops[i] <= x:
+                i += 1
+            if i == n:
+                return
+            if starts[i] <= x:
+                yield x
+
+    def count_members(self, values: Iterable[int]) -> int:
+        return sum(1 for _ in self.members(values))
+
+    # -- set algebra --------------------------------------------------------
+
+    def __or__(self, other: IntervalSet) -> IntervalSet:
+        return IntervalSet([*self, *other])
+
+    def __and__(self, other: IntervalSet) -> IntervalSet:
+        result: list[Interval] = []
+        a, b = list(self), list(other)
+        i = j = 0
+        while i < len(a) and j < len(b):
+            start = max(a[i][0], b[j][0])
+            stop = min(a[i][1], b[j][1])
+            if start < stop:
+                result.append((start, stop))
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet._from_normalized(result)
+
+    def __sub__(self, other: IntervalSet) -> IntervalSet:
+        result: list[Interval] = []
+        b = list(other)
+        j = 0
+        for start, stop in self:
+            while j < len(b) and b[j][1] <= start:
+                j += 1
+            k = j
+            while k < len(b) and b[k][0] < stop:
+                if b[k][0] > start:
+                    result.append((start, b[k][0]))
+                start = max(start, b[k][1])
+                k += 1
+            if start < stop:
+                result.append((start, stop))
+        return IntervalSet._from_normalized(result)
+
+    union = __or__
+    intersection = __and__
+    difference = __sub__
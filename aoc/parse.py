@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import re
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterator
+
+# Declarative line schemas: "{dir:char}{n:int}" describes lines like "L68".
+# Each schema is compiled once into a multiline regex; parsing a whole input
+# is then one findall over the raw text, and the matches are transposed into
+# typed columns (one per field) instead of per-line tuples of strings.
+
+_INTS_SEP = re.compile(r"[ ,;]+")
+
+# type -> (regex for one value, builds the column from the matched strings)
+FIELD_TYPES: dict[str, tuple[str, Callable[[list[str]], Any]]] = {
+    "int": (r"[-+]?\d+", lambda col: array("q", map(int, col))),
+    "char": (r".", "".join),
+    "word": (r"\w+", list),
+    "str": (r".*?", list),
+    "ints": (
+        r"[-+]?\d+(?:[ ,;]+[-+]?\d+)*",
+        lambda col: [tuple(map(int, _INTS_SEP.split(s))) for s in col],
+    ),
+}
+
+_TOKEN = re.compile(r"\{\{|\}\}|\{(\w+)(?::(\w+))?\}")
+
+
+@dataclass
+class Columns:
+    """Parsed fields, one column per field, all of the same length.
+
+    int columns are array('q'), char columns a single str, ints columns a
+    list of tuples and word/str columns a list of str.
+    """
+    names: tuple[str, ...]
+    data: dict[str, Any]
+
+    def __getitem__(self, name: str) -> Any:
+        return self.data[name]
+
+    def __len__(self) -> int:
+        """Number of parsed lines."""
+        return len(self.data[self.names[0]]) if self.names else 0
+
+    def rows(self) -> Iterator[tuple[Any, ...]]:
+        """Iterate line by line: one tuple of field values per parsed line."""
+        return zip(*(self.data[name] for name in self.names))
+
+
+@dataclass(frozen=True)
+class Schema:
+    spec: str
+    names: tuple[str, ...]
+    types: tuple[str, ...]
+    pattern: re.Pattern[str]
+
+    def parse(self, raw: str, *, strict: bool = True) -> Columns:
+        """Parse every line of raw into columns.
+
+        Blank lines are skipped. With strict=True a non-blank line that
+        doesn't match the schema raises ValueError; with strict=False such
+        lines are ignored, so one schema can pick its lines out of a mixed
+        input. Windows line endings are accepted.
+        """
+        if "\r" in raw:
+            raw = raw.replace("\r\n", "\n")
+        matches = self.pattern.findall(raw)
+        # The last group catches lines that don't fit the schema.
+        if strict:
+            for m in matches:
+                if m[-1]:
+                    raise ValueError(f"Line {m[-1]!r} does not match {self.spec!r}")
+        rows = [m[:-1] for m in matches if not m[-1]]
+        columns = list(zip(*rows)) if rows else [()] * len(self.names)
+        return Columns(
+            names=self.names,
+            data={
+                name: FIELD_TYPES[kind][1](list(col))
+                for name, kind, col in zip(self.names, self.types, columns)
+            },
+        )
+
+    def parse_line(self, line: str) -> tuple[Any, ...]:
+        """Parse a single line into a tuple of values."""
+        cols = self.parse(line)
+        if len(cols) != 1:
+            raise ValueError(f"Expected one line, got {len(cols)}")
+        return next(cols.rows())
+
+
+@lru_cache(maxsize=None)
+def compile_schema(spec: str) -> Schema:
+    """Compile a schema like "{w:int}x{h:int}: {counts:ints}" (cached per spec).
+
+    Fields are {name:type} with type one of FIELD_TYPES (default str); all
+    other text must match literally, with {{ and }} for literal braces.
+    """
+    parts: list[str] = []
+    names: list[str] = []
+    types: list[str] = []
+    pos = 0
+    for m in _TOKEN.finditer(spec):
+        parts.append(re.escape(spec[pos:m.start()]))
+        pos = m.end()
+        if m.group(0) in ("{{", "}}"):
+            parts.append(re.escape(m.group(0)[0]))
+            continue
+        name, kind = m.group(1), m.group(2) or "str"
+        if kind not in FIELD_TYPES:
+            raise ValueError(f"Unknown field type {kind!r} in {spec!r}")
+        if name in names:
+            raise ValueError(f"Duplicate field {name!r} in {spec!r}")
+        names.append(name)
+        types.append(kind)
+        parts.append(f"({FIELD_TYPES[kind][0]})")
+    parts.append(re.escape(spec[pos:]))
+    if not names:
+        raise ValueError(f"Schema {spec!r} has no fields")
+
+    pattern = re.compile(rf"^(?:{''.join(parts)}|(.+))$", re.MULTILINE)
+    return Schema(spec=spec, names=tuple(names), types=tuple(types), pattern=pattern)
+
+
+def parse_lines(spec: str, raw: str, *, strict: bool = True) -> Columns:
+    """Parse raw with the (cached) schema for spec; see Schema.parse."""
+    return compile_schema(spec).parse(raw, strict=strict)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from .grid import Pos, compress_coords, flood_fill_flat
+
+# A rectilinear polygon drawn on a grid of unit tiles: consecutive vertices
+# share a row or a column, and the tiles on the edges count as part of the
+# polygon (as do those enclosed by it).
+
+
+class RectilinearPolygon:
+    """Tile-containment queries for a rectilinear polygon with huge coordinates.
+
+    The vertex coordinates are compressed with gap bands (compress_coords), so
+    each compressed cell is uniformly inside or outside. The outside is
+    flood-filled over a flat bytearray mask from the padding corner, and 2-D
+    prefix sums over the outside cells make contains_rect O(1). Building costs
+    O(n^2) for n vertices, independent of the coordinate magnitudes.
+    """
+
+    def __init__(self, vertices: Sequence[Pos]) -> None:
+        if len(vertices) < 2:
+            raise ValueError("A polygon needs at least two vertices")
+        self.vertices = list(vertices)
+        self.coords = compress_coords(self.vertices, gaps=True, pad=True)
+        height, width = self.coords.shape
+
+        # Flat masks indexed i * width + j: one byte per compressed cell.
+        boundary = bytearray(height * width)
+        for k, a in enumerate(self.vertices):
+            b = self.vertices[(k + 1) % len(self.vertices)]
+            if a[0] != b[0] and a[1] != b[1]:
+                raise ValueError(f"Edge {a} -> {b} is not axis-aligned")
+            (i1, j1), (i2, j2) = self.coords.index(a), self.coords.index(b)
+            j1, j2 = min(j1, j2), max(j1, j2)
+            for i in range(min(i1, i2), max(i1, i2) + 1):
+                boundary[i * width + j1 : i * width + j2 + 1] = b"\x01" * (j2 - j1 + 1)
+
+        # Flood the outside from the padding corner, which is never on an edge.
+        outside = flood_fill_flat(boundary, width, [0])
+
+        # prefix[i][j]: number of outside cells in compressed rows < i, cols < j
+        prefix = [[0] * (width + 1) for _ in range(height + 1)]
+        for i in range(height):
+            above, row = prefix[i], prefix[i + 1]
+            run = 0
+            base = i * width
+            for j in range(width):
+                run += outside[base + j]
+                row[j + 1] = above[j + 1] + run
+        self._width = width
+        self._outside = outside
+        self._prefix = prefix
+
+    def contains(self, pos: Pos) -> bool:
+        """True if the tile at pos is on the boundary or inside."""
+        try:
+            i, j = self.coords.index(pos)
+        except IndexError:  # beyond the padding
+            return False
+        return not self._outside[i * self._width + j]
+
+    def contains_rect(self, corner1: Pos, corner2: Pos) -> bool:
+        """True if every tile of the rectangle spanned by two opposite corners is inside."""
+        (r1, c1), (r2, c2) = corner1, corner2
+        try:
+            i1, j1 = self.coords.index((min(r1, r2), min(c1, c2)))
+            i2, j2 = self.coords.index((max(r1, r2), max(c1, c2)))
+        except IndexError:
+            return False
+        p = self._prefix
+        outside = p[i2 + 1][j2 + 1] - p[i1][j2 + 1] - p[i2 + 1][j1] + p[i1][j1]
+        return outside == 0
+
+    def area(self) -> int:
+        """Number of tiles on or inside the polygon."""
+        height, width = self.coords.shape
+        return self.coords.total_area(
+            (i, j)
+            for i in range(height)
+            for j in range(width)
+            if not self._outside[i * width + j]
+        )
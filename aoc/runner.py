@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import importlib
+import os
+from collections.abc import Iterator
+from copy import deepcopy
+from dataclasses import dataclass, field
+from functools import partial
+from math import inf
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Callable
+
+from .common import TimingResult, read_example, read_input, time_call
+from .config import ROOT, get_year
+
+Solver = Callable[[Any], Any]
+
+
+def available_days() -> list[int]:
+    """Days that have a solution module in days/."""
+    return sorted(
+        int(p.stem[3:]) for p in (ROOT / "days").glob("day[0-9][0-9].py")
+    )
+
+
+def parse_days(spec: str) -> list[int]:
+    """Parse a day selection like "5", "1-12", "1,3,7-9" or "all"."""
+    if spec == "all":
+        return available_days()
+    days: list[int] = []
+    for item in spec.split(","):
+        lo, sep, hi = item.partition("-")
+        try:
+            first = int(lo)
+            last = int(hi) if sep else first
+        except ValueError:
+            raise ValueError(f"Invalid day selection: {spec!r}") from None
+        if not 1 <= first <= last <= 25:
+            raise ValueError(f"Invalid day range: {item!r}")
+        days.extend(d for d in range(first, last + 1) if d not in days)
+    return days
+
+
+def load_day(day: int) -> ModuleType:
+    module_name = f"days.day{day:02d}"
+    try:
+        return importlib.import_module(module_name)
+    except ModuleNotFoundError as exc:
+        raise SystemExit(f"Could not import {module_name}: {exc}")
+
+
+def with_workers(solve: Solver, workers: int | None) -> Solver:
+    """Bind workers= for parts that take it (those fanning out with solve_many).
+
+    Callers that already run days in a pool, or that time the parts, pass
+    workers=1 so the part doesn't start a nested process pool.
+    """
+    import inspect
+
+    if "workers" in inspect.signature(solve).parameters:
+        return partial(solve, workers=workers)
+    return solve
+
+
+def materialize(data: Any) -> Any:
+    """Turn one-shot iterators inside parsed data into lists so it can be reused.
+
+    Recurses into tuples, lists and dict values; everything else is returned as is.
+    """
+    if isinstance(data, Iterator):
+        return [materialize(x) for x in data]
+    if isinstance(data, tuple):
+        return tuple(materialize(x) for x in data)
+    if isinstance(data, list):
+        return [materialize(x) for x in data]
+    if isinstance(data, dict):
+        return {k: materialize(v) for k, v in data.items()}
+    return data
+
+
+@dataclass
+class DayRun:
+    day: int
+    read: TimingResult
+    parse: TimingResult
+    parts: dict[int, TimingResult] = field(default_factory=dict)
+
+
+def solve_day(
+    day: int,
+    parse_input: Solver,
+    part1: Solver,
+    part2: Solver | None = None,
+    *,
+    raw: str | None = None,
+) -> DayRun:
+    """Read and parse the input once, then solve each part on its own copy.
+
+    Reading, parsing and each part are timed separately. Each part receives a
+    deep copy of the parsed data (made outside the timed region), so parts
+    can't see each other's mutations.
+    """
+    read = time_call(read_input, day) if raw is None else TimingResult(raw, 0.0)
+    parse = time_call(parse_input, read.value)
+    data = materialize(parse.value)
+    parse.value = data
+
+    run = DayRun(day=day, read=read, parse=parse)
+    for n, solve in ((1, part1), (2, part2)):
+        if solve is None:
+            continue
+        run.parts[n] = time_call(solve, deepcopy(data))
+    return run
+
+
+def print_day_run(run: DayRun) -> None:
+    year = get_year()
+    print(
+        f"{year} Day {run.day} - Input: read {run.read.seconds:.3f}s, "
+        f"parse {run.parse.seconds:.3f}s"
+    )
+    for n, res in run.parts.items():
+        print(f"{year} Day {run.day} - Part {n}: {res.value} ({res.seconds:.3f}s)")
+
+
+def run_day(
+    day: int,
+    parse_input: Solver,
+    part1: Solver,
+    part2: Solver | None = None,
+) -> DayRun:
+    """Solve a day on its real input and print the results (used by main())."""
+    run = solve_day(day, parse_input, part1, part2)
+    print_day_run(run)
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Running many days at once
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PartRun:
+    day: int
+    part: int
+    value: Any = None
+    parse_seconds: float = 0.0
+    solve_seconds: float = 0.0
+    error: str | None = None
+
+
+def run_part(day: int, part: int, example: int | None = None) -> PartRun:
+    """Read, parse and solve a single part (the unit of work for run_parallel)."""
+    module = load_day(day)
+    raw = read_input(day) if example is None else read_example(day, example)
+    parse = time_call(module.parse_input, raw)
+    # Already in a pool worker, so parts must not start their own pools
+    solver = with_workers(getattr(module, f"part{part}"), 1)
+    solve = time_call(solver, materialize(parse.value))
+    return PartRun(day, part, solve.value, parse.seconds, solve.seconds)
+
+
+def run_parallel(
+    days: list[int],
+    *,
+    workers: int | None = None,
+    example: int | None = None,
+    expected: dict[tuple[int, str], float] | None = None,
+) -> list[PartRun]:
+    """Solve every part of `days` on a process pool.
+
+    Parts are submitted longest-expected-first, using `expected` seconds keyed
+    by (day, "partN"), so the slowest ones don't end up starting last. Parts
+    without a recorded timing are assumed to be slow. Results come back sorted
+    by day and part; failures are reported in PartRun.error instead of raised.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    expected = expected or {}
+    tasks = [
+        (day, part)
+        for day in days
+        for part in (1, 2)
+        if hasattr(load_day(day), f"part{part}")
+    ]
+    tasks.sort(key=lambda t: expected.get((t[0], f"part{t[1]}"), inf), reverse=True)
+
+    if workers is None:
+        workers = min(len(tasks), os.cpu_count() or 1)
+
+    runs: list[PartRun] = []
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            (day, part): pool.submit(run_part, day, part, example)
+            for day, part in tasks
+        }
+        for (day, part), fut in futures.items():
+            try:
+                runs.append(fut.result())
+            except Exception as exc:
+                runs.append(PartRun(day, part, error=f"{type(exc).__name__}: {exc}"))
+    return sorted(runs, key=lambda r: (r.day, r.part))
+
+
+def format_part_runs(runs: list[PartRun]) -> str:
+    """Return a fixed-width results table for run_parallel."""
+    header = f"{'day':>3} {'part':>4}  {'answer':<20} {'parse s':>9} {'solve s':>9}"
+    lines = [header, "-" * len(header)]
+    for r in runs:
+        if r.error is not None:
+            lines.append(f"{r.day:>3} {r.part:>4}  error: {r.error}")
+            continue
+        lines.append(
+            f"{r.day:>3} {r.part:>4}  {str(r.value):<20} "
+            f"{r.parse_seconds:>9.3f} {r.solve_seconds:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def run_many(
+    days: list[int],
+    *,
+    workers: int | None = None,
+    example: int | None = None,
+    expected: dict[tuple[int, str], float] | None = None,
+) -> list[PartRun]:
+    """run_parallel plus a printed results table and wall-clock summary."""
+    start = perf_counter()
+    runs = run_parallel(days, workers=workers, example=example, expected=expected)
+    wall = perf_counter() - start
+
+    print(f"{get_year()} Days {', '.join(str(d) for d in days)}")
+    print(format_part_runs(runs))
+    busy = sum(r.parse_seconds + r.solve_seconds for r in runs)
+    print(f"Total: {wall:.3f}s wall, {busy:.3f}s solving")
+    return runs
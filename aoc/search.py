@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+from array import array
 from collections import deque, defaultdict
-from collections.abc import Callable, Hashable, Iterable
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
-from functools import cache
+from functools import partial
+from itertools import count, repeat
 from math import inf
-from typing import DefaultDict, Generic, TypeAlias, TypeVar
+from mmap import mmap
+from pathlib import Path
+from time import perf_counter
+from typing import Any, DefaultDict, Generic, TypeAlias, TypeVar, cast
 import heapq
+import os
+
+from .common import iter_lines
 
 T = TypeVar("T", bound=Hashable)
 U = TypeVar("U", bound=Hashable)
@@ -14,8 +22,15 @@ R = TypeVar("R")
 
 Weight: TypeAlias = float | int
 
+# Largest edge weight for which CompiledGraph picks a bucket queue over a heap.
+DIAL_MAX_WEIGHT = 1024
+
+
+class CycleError(ValueError):
+    """Raised by the DAG-only algorithms when they run into a cycle."""
 
-def reconstruct_path(parent: dict[T, T], end: T) -> list[T]:
+
+def reconstruct_path(parent: Mapping[T, T], end: T) -> list[T]:
     """Reconstruct a path from a root to 'end' using a parent map (stops when no parent exists)."""
     path: list[T] = [end]
     cur = end
@@ -26,10 +41,84 @@ def reconstruct_path(parent: dict[T, T], end: T) -> list[T]:
     return path
 
 
+class DenseDist(Mapping[int, Any]):
+    """Read-only map for int states in range(len(data)), backed by an array or list.
+
+    Entries equal to `missing` are absent. Used by bfs/dijkstra(state_bound=...)
+    for distances and parents, so they cost one slot per possible state instead
+    of a dict entry each.
+    """
+
+    def __init__(self, data: array | list, missing: Any = -1) -> None:
+        self.data = data
+        self.missing = missing
+
+    def __getitem__(self, key: int) -> Any:
+        if not 0 <= key < len(self.data) or self.data[key] == self.missing:
+            raise KeyError(key)
+        return self.data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            isinstance(key, int)
+            and 0 <= key < len(self.data)
+            and self.data[key] != self.missing
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        missing = self.missing
+        return (i for i, d in enumerate(self.data) if d != missing)
+
+    def __len__(self) -> int:
+        return len(self.data) - self.data.count(self.missing)
+
+
+class BitSet:
+    """Set of ints in range(size), one bit per possible member."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+
+    def add(self, i: int) -> None:
+        self.bits[i >> 3] |= 1 << (i & 7)
+
+    def discard(self, i: int) -> None:
+        self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def __contains__(self, i: object) -> bool:
+        return (
+            isinstance(i, int)
+            and 0 <= i < self.size
+            and bool(self.bits[i >> 3] & (1 << (i & 7)))
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return (i for i in range(self.size) if self.bits[i >> 3] & (1 << (i & 7)))
+
+    def __len__(self) -> int:
+        return sum(bin(b).count("1") for b in self.bits)
+
+
+@dataclass
+class CostResult(Generic[T]):
+    """Search result without a parent map (track_parents=False): costs only."""
+    dist: Mapping[T, Weight]
+    goal: T | None = None
+
+    def cost_to(self, target: T) -> Weight | None:
+        return self.dist.get(target)
+
+    def goal_cost(self) -> Weight | None:
+        if self.goal is None:
+            return None
+        return self.dist.get(self.goal)
+
+
 @dataclass
 class SearchResult(Generic[T]):
-    dist: dict[T, Weight]
-    parent: dict[T, T]
+    dist: Mapping[T, Weight]
+    parent: Mapping[T, T]
     goal: T | None = None
 
     def path_to(self, target: T) -> list[T] | None:
@@ -51,14 +140,38 @@ class SearchResult(Generic[T]):
         return self.dist.get(self.goal)
 
 
+def _result(
+    dist: Mapping[T, Weight],
+    parent: Mapping[T, T] | None,
+    goal: T | None,
+) -> SearchResult[T] | CostResult[T]:
+    if parent is None:
+        return CostResult(dist=dist, goal=goal)
+    return SearchResult(dist=dist, parent=parent, goal=goal)
+
+
 def bfs(
     starts: Iterable[T],
-    neighbors: Callable[[T], Iterable[T]],
+    neighbors: Callable[[T], Iterable[T]] | CompiledGraph[T],
     is_goal: Callable[[T], bool] | None = None,
-) -> SearchResult[T]:
-    """Breadth-first search from one or more start states (unweighted)."""
+    *,
+    track_parents: bool = True,
+    state_bound: int | None = None,
+) -> SearchResult[T] | CostResult[T]:
+    """Breadth-first search from one or more start states (unweighted).
+
+    neighbors may be a CompiledGraph, which runs the search over its arrays.
+    track_parents=False skips the parent map and returns a CostResult.
+    state_bound=n declares that states are ints in range(n); distances are
+    then kept in one flat array (a DenseDist) instead of a dict.
+    """
+    if isinstance(neighbors, CompiledGraph):
+        return neighbors.bfs(starts, is_goal, track_parents=track_parents)
+    if state_bound is not None:
+        return _bfs_dense(starts, neighbors, is_goal, track_parents, state_bound)  # type: ignore[arg-type]
+
     dist: dict[T, int] = {}
-    parent: dict[T, T] = {}
+    parent: dict[T, T] | None = {} if track_parents else None
     q: deque[T] = deque()
 
     for s in starts:
@@ -78,41 +191,193 @@ def bfs(
             if nxt in dist:
                 continue
             dist[nxt] = dist[current] + 1
-            parent[nxt] = current
+            if parent is not None:
+                parent[nxt] = current
             q.append(nxt)
 
-    return SearchResult(dist=dist, parent=parent, goal=found)
+    return _result(dist, parent, found)
+
+
+def _bfs_dense(
+    starts: Iterable[int],
+    neighbors: Callable[[int], Iterable[int]],
+    is_goal: Callable[[int], bool] | None,
+    track_parents: bool,
+    state_bound: int,
+) -> SearchResult[int] | CostResult[int]:
+    """bfs over int states in range(state_bound) using flat arrays."""
+    dist = array("q", [-1]) * state_bound
+    parent = array("q", [-1]) * state_bound if track_parents else None
+    q: deque[int] = deque()
+
+    for s in starts:
+        if dist[s] >= 0:
+            continue
+        dist[s] = 0
+        q.append(s)
+
+    found: int | None = None
+
+    while q:
+        current = q.popleft()
+        if is_goal is not None and is_goal(current):
+            found = current
+            break
+        d_next = dist[current] + 1
+        for nxt in neighbors(current):
+            if dist[nxt] >= 0:
+                continue
+            dist[nxt] = d_next
+            if parent is not None:
+                parent[nxt] = current
+            q.append(nxt)
+
+    return _result(DenseDist(dist), None if parent is None else DenseDist(parent), found)
 
 
 def bfs_one(
     start: T,
-    neighbors: Callable[[T], Iterable[T]],
+    neighbors: Callable[[T], Iterable[T]] | CompiledGraph[T],
     is_goal: Callable[[T], bool] | None = None,
-) -> SearchResult[T]:
+    *,
+    track_parents: bool = True,
+    state_bound: int | None = None,
+) -> SearchResult[T] | CostResult[T]:
     """Breadth-first search from one start states (unweighted)."""
-    return bfs([start], neighbors, is_goal)
+    return bfs(
+        [start], neighbors, is_goal, track_parents=track_parents, state_bound=state_bound
+    )
+
+
+def _expand_layer(
+    frontier: list[T],
+    neighbors: Callable[[T], Iterable[T]],
+    dist: dict[T, int],
+    parent: dict[T, T] | None,
+    other_dist: dict[T, int],
+) -> tuple[list[T], T | None]:
+    """Expand one BFS layer; return the next layer and the best meeting state."""
+    layer: list[T] = []
+    best: Weight = inf
+    meet: T | None = None
+    for current in frontier:
+        d_next = dist[current] + 1
+        for nxt in neighbors(current):
+            if nxt in dist:
+                continue
+            dist[nxt] = d_next
+            if parent is not None:
+                parent[nxt] = current
+            layer.append(nxt)
+            if nxt in other_dist and d_next + other_dist[nxt] < best:
+                best = d_next + other_dist[nxt]
+                meet = nxt
+    return layer, meet
+
+
+def bfs_bidirectional(
+    start: T,
+    goal: T,
+    neighbors: Callable[[T], Iterable[T]],
+    reverse_neighbors: Callable[[T], Iterable[T]] | None = None,
+    *,
+    track_parents: bool = True,
+) -> SearchResult[T] | CostResult[T]:
+    """Breadth-first search from start and goal at once (unweighted).
+
+    Each round expands a full layer of the smaller frontier, stopping once the
+    two searches meet, so roughly sqrt as many states are visited as with bfs.
+    reverse_neighbors(state) -> states with an edge *to* state; defaults to
+    neighbors, which is right for symmetric moves (undirected graphs, XOR, ...).
+
+    The result holds the states reached from start plus the meeting point's
+    path on to goal, so goal_cost() and path_to_goal() work as usual.
+    With track_parents=False it is a CostResult with the goal's cost added.
+    """
+    if reverse_neighbors is None:
+        reverse_neighbors = neighbors
+
+    dist_f: dict[T, int] = {start: 0}
+    parent_f: dict[T, T] | None = {} if track_parents else None
+    dist_b: dict[T, int] = {goal: 0}
+    toward_goal: dict[T, T] | None = {} if track_parents else None
+    front_f: list[T] = [start]
+    front_b: list[T] = [goal]
+
+    meet: T | None = start if start == goal else None
+    while meet is None and front_f and front_b:
+        if len(front_f) <= len(front_b):
+            front_f, meet = _expand_layer(front_f, neighbors, dist_f, parent_f, dist_b)
+        else:
+            front_b, meet = _expand_layer(front_b, reverse_neighbors, dist_b, toward_goal, dist_f)
+
+    if meet is None:
+        return _result(dist_f, parent_f, None)
+
+    if parent_f is None or toward_goal is None:
+        dist_f[goal] = dist_f[meet] + dist_b[meet]
+        return CostResult(dist=dist_f, goal=goal)
+
+    # The meeting state is known to both searches; extend the forward tree
+    # from it along the backward tree's path to goal.
+    cur = meet
+    while cur in toward_goal:
+        nxt = toward_goal[cur]
+        dist_f[nxt] = dist_f[cur] + 1
+        parent_f[nxt] = cur
+        cur = nxt
+    return SearchResult(dist=dist_f, parent=parent_f, goal=goal)
 
 
 def dijkstra(
     starts: Iterable[T],
-    neighbors: Callable[[T], Iterable[tuple[T, Weight]]],
+    neighbors: Callable[[T], Iterable[tuple[T, Weight]]] | CompiledGraph[T],
     is_goal: Callable[[T], bool] | None = None,
-) -> SearchResult[T]:
-    """Dijkstra's algorithm for non-negative edge weights."""
+    *,
+    track_parents: bool = True,
+    max_weight: int | None = None,
+    state_bound: int | None = None,
+) -> SearchResult[T] | CostResult[T]:
+    """Dijkstra's algorithm for non-negative edge weights.
+
+    neighbors may be a CompiledGraph, which runs the search over its arrays
+    (and picks a bucket queue by itself when its weights allow it).
+    track_parents=False skips the parent map and returns a CostResult.
+    max_weight=k promises that every weight is an int in 0..k, which swaps the
+    heap for a bucket queue: bfs_01 for k <= 1, dijkstra_buckets otherwise.
+    state_bound=n declares that states are ints in range(n), so distances and
+    parents are kept in flat lists (DenseDist) instead of dicts. The bucket
+    queues don't support it, so passing both raises ValueError.
+    """
+    if isinstance(neighbors, CompiledGraph):
+        return neighbors.dijkstra(starts, is_goal, track_parents=track_parents)
+    if max_weight is not None and state_bound is not None:
+        raise ValueError("state_bound can't be combined with max_weight")
+    if max_weight is not None:
+        if max_weight <= 1:
+            return bfs_01(starts, neighbors, is_goal, track_parents=track_parents)
+        return dijkstra_buckets(
+            starts, neighbors, is_goal, max_weight=max_weight, track_parents=track_parents
+        )
+    if state_bound is not None:
+        return _dijkstra_dense(starts, neighbors, is_goal, track_parents, state_bound)  # type: ignore[arg-type]
+
     dist: dict[T, Weight] = {}
-    parent: dict[T, T] = {}
-    heap: list[tuple[Weight, T]] = []
+    parent: dict[T, T] | None = {} if track_parents else None
+    # The counter breaks ties so states themselves are never compared.
+    tie = count()
+    heap: list[tuple[Weight, int, T]] = []
 
     for s in starts:
         if s in dist:
             continue
         dist[s] = 0
-        heapq.heappush(heap, (0, s))
+        heapq.heappush(heap, (0, next(tie), s))
 
     found: T | None = None
 
     while heap:
-        d_cur, node = heapq.heappop(heap)
+        d_cur, _, node = heapq.heappop(heap)
         if d_cur != dist.get(node, inf):
             continue
 
@@ -124,28 +389,205 @@ def dijkstra(
             new_d = d_cur + w
             if new_d < dist.get(nxt, inf):
                 dist[nxt] = new_d
-                parent[nxt] = node
+                if parent is not None:
+                    parent[nxt] = node
+                heapq.heappush(heap, (new_d, next(tie), nxt))
+
+    return _result(dist, parent, found)
+
+
+def _dijkstra_dense(
+    starts: Iterable[int],
+    neighbors: Callable[[int], Iterable[tuple[int, Weight]]],
+    is_goal: Callable[[int], bool] | None,
+    track_parents: bool,
+    state_bound: int,
+) -> SearchResult[int] | CostResult[int]:
+    """dijkstra over int states in range(state_bound) using flat lists."""
+    dist: list[Weight] = [inf] * state_bound
+    parent = array("q", [-1]) * state_bound if track_parents else None
+    # States are ints, so they can break ties themselves.
+    heap: list[tuple[Weight, int]] = []
+
+    for s in starts:
+        if dist[s] == 0:
+            continue
+        dist[s] = 0
+        heapq.heappush(heap, (0, s))
+
+    found: int | None = None
+
+    while heap:
+        d_cur, node = heapq.heappop(heap)
+        if d_cur != dist[node]:
+            continue
+
+        if is_goal is not None and is_goal(node):
+            found = node
+            break
+
+        for nxt, w in neighbors(node):
+            new_d = d_cur + w
+            if new_d < dist[nxt]:
+                dist[nxt] = new_d
+                if parent is not None:
+                    parent[nxt] = node
                 heapq.heappush(heap, (new_d, nxt))
 
-    return SearchResult(dist=dist, parent=parent, goal=found)
+    return _result(
+        DenseDist(dist, missing=inf),
+        None if parent is None else DenseDist(parent),
+        found,
+    )
 
 
 def dijkstra_one(
     start: T,
-    neighbors: Callable[[T], Iterable[tuple[T, Weight]]],
+    neighbors: Callable[[T], Iterable[tuple[T, Weight]]] | CompiledGraph[T],
     is_goal: Callable[[T], bool] | None = None,
-) -> SearchResult[T]:
-    """Iterative depth-first traversal yielding nodes in pre-order."""
-    return dijkstra([start], neighbors, is_goal)
+    *,
+    track_parents: bool = True,
+    max_weight: int | None = None,
+    state_bound: int | None = None,
+) -> SearchResult[T] | CostResult[T]:
+    """Dijkstra's algorithm from a single start state."""
+    return dijkstra(
+        [start],
+        neighbors,
+        is_goal,
+        track_parents=track_parents,
+        max_weight=max_weight,
+        state_bound=state_bound,
+    )
+
+
+def _check_weight(w: Weight, max_weight: int) -> None:
+    if w.__class__ is not int or not 0 <= w <= max_weight:
+        raise ValueError(f"Edge weight {w!r} is not an int in 0..{max_weight}")
+
+
+def dijkstra_buckets(
+    starts: Iterable[T],
+    neighbors: Callable[[T], Iterable[tuple[T, int]]],
+    is_goal: Callable[[T], bool] | None = None,
+    *,
+    max_weight: int,
+    track_parents: bool = True,
+) -> SearchResult[T] | CostResult[T]:
+    """Dial's algorithm: Dijkstra with a bucket queue for int weights in 0..max_weight.
+
+    Pending states sit in max_weight + 1 buckets indexed by distance modulo
+    the bucket count, so pushes and pops are O(1) and states are never
+    compared. Raises ValueError on a weight outside 0..max_weight.
+    """
+    size = max_weight + 1
+    buckets: list[list[T]] = [[] for _ in range(size)]
+    dist: dict[T, int] = {}
+    parent: dict[T, T] | None = {} if track_parents else None
+    pending = 0
+
+    for s in starts:
+        if s in dist:
+            continue
+        dist[s] = 0
+        buckets[0].append(s)
+        pending += 1
+
+    found: T | None = None
+    d_cur = 0
+
+    while pending:
+        # Everything in this bucket was pushed at distance d_cur: later pushes
+        # land at most max_weight ahead, i.e. in a different bucket.
+        bucket = buckets[d_cur % size]
+        while bucket:
+            node = bucket.pop()
+            pending -= 1
+            if dist[node] != d_cur:
+                continue
+
+            if is_goal is not None and is_goal(node):
+                found = node
+                break
+
+            for nxt, w in neighbors(node):
+                _check_weight(w, max_weight)
+                new_d = d_cur + w
+                if new_d < dist.get(nxt, inf):
+                    dist[nxt] = new_d
+                    if parent is not None:
+                        parent[nxt] = node
+                    buckets[new_d % size].append(nxt)
+                    pending += 1
+        if found is not None:
+            break
+        d_cur += 1
+
+    return _result(dist, parent, found)
+
+
+def bfs_01(
+    starts: Iterable[T],
+    neighbors: Callable[[T], Iterable[tuple[T, int]]],
+    is_goal: Callable[[T], bool] | None = None,
+    *,
+    track_parents: bool = True,
+) -> SearchResult[T] | CostResult[T]:
+    """0-1 BFS: shortest paths when every edge weight is 0 or 1.
+
+    Weight-0 moves go to the front of the deque and weight-1 moves to the
+    back, so states come out in distance order without a heap.
+    Raises ValueError on any other weight.
+    """
+    dist: dict[T, int] = {}
+    parent: dict[T, T] | None = {} if track_parents else None
+    q: deque[tuple[int, T]] = deque()
+
+    for s in starts:
+        if s in dist:
+            continue
+        dist[s] = 0
+        q.append((0, s))
+
+    found: T | None = None
+
+    while q:
+        d_cur, node = q.popleft()
+        if d_cur != dist[node]:
+            continue
+
+        if is_goal is not None and is_goal(node):
+            found = node
+            break
+
+        for nxt, w in neighbors(node):
+            _check_weight(w, 1)
+            new_d = d_cur + w
+            if new_d < dist.get(nxt, inf):
+                dist[nxt] = new_d
+                if parent is not None:
+                    parent[nxt] = node
+                if w:
+                    q.append((new_d, nxt))
+                else:
+                    q.appendleft((new_d, nxt))
+
+    return _result(dist, parent, found)
 
 
 def dfs(
     start: T,
     neighbors: Callable[[T], Iterable[T]],
     is_valid: Callable[[T], bool] | None = None,
+    *,
+    state_bound: int | None = None,
 ) -> Iterable[T]:
-    """Iterative depth-first traversal yielding nodes in pre-order."""
-    seen: set[T] = set()
+    """Iterative depth-first traversal yielding nodes in pre-order.
+
+    state_bound=n declares that states are ints in range(n), so the seen set
+    can be a BitSet (n / 8 bytes) instead of a set.
+    """
+    seen: set[T] | BitSet = set() if state_bound is None else BitSet(state_bound)
     stack: list[T] = [start]
 
     while stack:
@@ -169,32 +611,40 @@ def dfs(
 def astar(
     starts: Iterable[T],
     is_goal: Callable[[T], bool],
-    neighbors: Callable[[T], Iterable[tuple[T, Weight]]],
+    neighbors: Callable[[T], Iterable[tuple[T, Weight]]] | CompiledGraph[T],
     heuristic: Callable[[T], float] | None = None,
-) -> SearchResult[T]:
+    *,
+    track_parents: bool = True,
+) -> SearchResult[T] | CostResult[T]:
     """
     A* for non-negative edge weights.
 
-    neighbors(state) -> iterable of (next_state, step_cost).
+    neighbors(state) -> iterable of (next_state, step_cost), or a CompiledGraph.
     heuristic(state) -> estimated remaining cost (>=0).
+    track_parents=False skips the parent map and returns a CostResult.
     """
+    if isinstance(neighbors, CompiledGraph):
+        return neighbors.dijkstra(starts, is_goal, heuristic, track_parents=track_parents)
+
     def _h(x: T) -> float:
         return 0.0 if heuristic is None else float(heuristic(x))
 
-    open_heap: list[tuple[float, Weight, T]] = []
-    parent: dict[T, T] = {}
+    # The counter breaks ties so states themselves are never compared.
+    tie = count()
+    open_heap: list[tuple[float, Weight, int, T]] = []
+    parent: dict[T, T] | None = {} if track_parents else None
     g: dict[T, Weight] = {}
 
     for s in starts:
         if s in g:
             continue
         g[s] = 0
-        heapq.heappush(open_heap, (_h(s), 0, s))
+        heapq.heappush(open_heap, (_h(s), 0, next(tie), s))
 
     found: T | None = None
 
     while open_heap:
-        _f, g_cur, node = heapq.heappop(open_heap)
+        _f, g_cur, _, node = heapq.heappop(open_heap)
         if g_cur != g.get(node, inf):
             continue
 
@@ -206,25 +656,28 @@ def astar(
             new_g = g_cur + cost
             if new_g < g.get(nxt, inf):
                 g[nxt] = new_g
-                parent[nxt] = node
-                heapq.heappush(open_heap, (float(new_g) + _h(nxt), new_g, nxt))
+                if parent is not None:
+                    parent[nxt] = node
+                heapq.heappush(open_heap, (float(new_g) + _h(nxt), new_g, next(tie), nxt))
 
-    return SearchResult(dist=g, parent=parent, goal=found)
+    return _result(g, parent, found)
 
 
 def astar_one(
     start: T,
     is_goal: Callable[[T], bool],
-    neighbors: Callable[[T], Iterable[tuple[T, Weight]]],
+    neighbors: Callable[[T], Iterable[tuple[T, Weight]]] | CompiledGraph[T],
     heuristic: Callable[[T], float] | None = None,
-) -> SearchResult[T]:
+    *,
+    track_parents: bool = True,
+) -> SearchResult[T] | CostResult[T]:
     """
     A* for non-negative edge weights.
 
     neighbors(state) -> iterable of (next_state, step_cost).
     heuristic(state) -> estimated remaining cost (>=0).
     """
-    return astar([start], is_goal, neighbors, heuristic)
+    return astar([start], is_goal, neighbors, heuristic, track_parents=track_parents)
 
 
 
@@ -242,17 +695,17 @@ def build_graph(
     bidirectional=True will add reverse edges for each neighbor.
     dedupe=True will remove duplicate edges while preserving first-seen order.
     """
-    graph: DefaultDict[U, list[U]] = defaultdict(list)
-    seen: DefaultDict[U, set[U]] = defaultdict(set)
+    # With dedupe, each adjacency is an insertion-ordered dict used as a set,
+    # so one structure both dedupes and keeps first-seen order.
+    graph: DefaultDict[U, list[U]] | DefaultDict[U, dict[U, None]] = (
+        defaultdict(dict) if dedupe else defaultdict(list)
+    )
 
     def _add_edge(a: U, b: U) -> None:
-        if not dedupe:
-            graph[a].append(b)
-            return
-        if b in seen[a]:
-            return
-        seen[a].add(b)
-        graph[a].append(b)
+        if dedupe:
+            graph[a][b] = None  # type: ignore[index]
+        else:
+            graph[a].append(b)  # type: ignore[union-attr]
 
     for line in lines:
         text = line.strip()
@@ -268,7 +721,695 @@ def build_graph(
                 _ = graph[n]
                 _add_edge(n, node)
 
-    return dict(graph)
+    if not dedupe:
+        return dict(graph)  # type: ignore[arg-type]
+    return {node: list(neighs) for node, neighs in graph.items()}
+
+
+def read_graph(
+    source: str | Path | bytes | bytearray | mmap,
+    parse_line: Callable[[str], tuple[U, Iterable[U]]],
+    *,
+    bidirectional: bool = False,
+    dedupe: bool = True,
+    csr: bool = False,
+) -> dict[U, list[U]] | CompiledGraph[U]:
+    """Build a graph like build_graph, streaming lines from a file or buffer.
+
+    source is a file path (read line by line, never whole) or a bytes-like
+    buffer such as an mmap. Node names are interned to ints as they appear and
+    edges are kept in two flat int arrays; a counting sort then groups them
+    into CSR form, deduping each node's edges in first-seen order.
+
+    csr=True returns that as a CompiledGraph; otherwise the same
+    dict[node, list[node]] as build_graph.
+    """
+    ids: dict[U, int] = {}
+    nodes: list[U] = []
+    # build_graph only has keys for nodes it saw as sources, in first-seen order
+    is_key = bytearray()
+    keys = array("q")
+    src = array("q")
+    dst = array("q")
+
+    def _id(node: U) -> int:
+        i = ids.get(node)
+        if i is None:
+            i = ids[node] = len(nodes)
+            nodes.append(node)
+            is_key.append(0)
+        return i
+
+    for line in iter_lines(source):
+        text = line.strip()
+        if not text:
+            continue
+        node, neighs = parse_line(text)
+        a = _id(node)
+        if not is_key[a]:
+            is_key[a] = 1
+            keys.append(a)
+        for n in neighs:
+            b = _id(n)
+            src.append(a)
+            dst.append(b)
+            if bidirectional:
+                if not is_key[b]:
+                    is_key[b] = 1
+                    keys.append(b)
+                src.append(b)
+                dst.append(a)
+
+    # Counting sort by source; stable, so each row keeps first-seen order.
+    n_nodes = len(nodes)
+    offsets = array("q", [0]) * (n_nodes + 1)
+    for a in src:
+        offsets[a + 1] += 1
+    for i in range(n_nodes):
+        offsets[i + 1] += offsets[i]
+    fill = offsets[:-1]
+    targets = array("q", [0]) * len(dst)
+    for a, b in zip(src, dst):
+        targets[fill[a]] = b
+        fill[a] += 1
+    del src, dst, fill
+
+    if dedupe:
+        compact = array("q")
+        new_offsets = array("q", [0])
+        for i in range(n_nodes):
+            compact.extend(dict.fromkeys(targets[offsets[i]:offsets[i + 1]]))
+            new_offsets.append(len(compact))
+        targets, offsets = compact, new_offsets
+
+    if csr:
+        return CompiledGraph(nodes, offsets, targets, index=ids)
+    return {
+        nodes[i]: [nodes[j] for j in targets[offsets[i]:offsets[i + 1]]]
+        for i in keys
+    }
+
+
+def reachable(
+    starts: Iterable[U],
+    graph: Mapping[U, Iterable[U]],
+) -> set[U]:
+    """All nodes reachable from starts (including the starts themselves)."""
+    seen: set[U] = set(starts)
+    stack = list(seen)
+    while stack:
+        for nxt in graph.get(stack.pop(), ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+def reverse_graph(graph: Mapping[U, Iterable[U]]) -> dict[U, list[U]]:
+    """Return the graph with every edge reversed (all nodes kept as keys)."""
+    rev: dict[U, list[U]] = {node: [] for node in graph}
+    for node, neighs in graph.items():
+        for n in neighs:
+            rev.setdefault(n, []).append(node)
+    return rev
+
+
+@dataclass
+class CompressedGraph(Generic[U]):
+    """Result of compress_graph.
+
+    graph: weighted adjacency {node: [(neighbor, weight), ...]} between the
+      kept nodes; parallel edges are kept, so path counts are preserved.
+    via: interior nodes of the cheapest collapsed chain between two kept
+      nodes, used by expand_path.
+    """
+    graph: dict[U, list[tuple[U, Weight]]]
+    via: dict[tuple[U, U], list[U]]
+
+    def neighbors(self, node: U) -> list[U]:
+        """Unweighted view (one entry per edge), e.g. for count_paths."""
+        return [n for n, _ in self.graph.get(node, ())]
+
+    def weighted_neighbors(self, node: U) -> list[tuple[U, Weight]]:
+        """Weighted view, e.g. for dijkstra."""
+        return self.graph.get(node, [])
+
+    def expand_path(self, path: list[U]) -> list[U]:
+        """Turn a path over kept nodes back into a path over the original graph."""
+        if not path:
+            return []
+        full = [path[0]]
+        for a, b in zip(path, path[1:]):
+            full.extend(self.via.get((a, b), ()))
+            full.append(b)
+        return full
+
+
+def compress_graph(
+    graph: Mapping[U, Iterable[U]] | Mapping[U, Iterable[tuple[U, Weight]]],
+    *,
+    starts: Iterable[U] | None = None,
+    goals: Iterable[U] | None = None,
+    keep: Iterable[U] = (),
+    directed: bool = True,
+    weighted: bool = False,
+) -> CompressedGraph[U]:
+    """Shrink a graph before searching or counting paths on it.
+
+    1. Prune: with starts, drop nodes not reachable from them; with goals,
+       drop nodes that can't reach one of them.
+    2. Contract: collapse chains of pass-through nodes into single edges
+       whose weight is the chain's total weight. A node passes through when
+       it is not in keep/starts/goals and
+         - directed=True: it has exactly one edge in and one edge out;
+         - directed=False (symmetric graphs, e.g. mazes): it has exactly two
+           distinct neighbours.
+
+    weighted=True means the mapping holds (neighbor, weight) pairs; otherwise
+    every edge weighs 1. Chains of pass-through nodes that never touch a kept
+    node (isolated cycles) are dropped.
+    """
+    edges: dict[U, list[tuple[U, Weight]]] = {}
+    for node, neighs in graph.items():
+        edges[node] = [e if weighted else (e, 1) for e in neighs]  # type: ignore[misc]
+        for n, _ in edges[node]:
+            edges.setdefault(n, [])
+
+    starts = list(starts) if starts is not None else None
+    goals = list(goals) if goals is not None else None
+    plain = {node: [n for n, _ in es] for node, es in edges.items()}
+    relevant = set(edges)
+    if starts is not None:
+        relevant &= reachable(starts, plain)
+    if goals is not None:
+        relevant &= reachable(goals, reverse_graph(plain))
+    edges = {
+        node: [(n, w) for n, w in es if n in relevant]
+        for node, es in edges.items()
+        if node in relevant
+    }
+
+    fixed = set(keep) | set(starts or ()) | set(goals or ())
+    in_degree: dict[U, int] = dict.fromkeys(edges, 0)
+    for es in edges.values():
+        for n, _ in es:
+            in_degree[n] += 1
+
+    def passes_through(node: U) -> bool:
+        if node in fixed:
+            return False
+        es = edges[node]
+        if directed:
+            return in_degree[node] == 1 and len(es) == 1 and es[0][0] != node
+        return len({n for n, _ in es}) == 2 and len(es) == 2
+
+    kept = [node for node in edges if not passes_through(node)]
+    kept_set = set(kept)
+    result: dict[U, list[tuple[U, Weight]]] = {node: [] for node in kept}
+    via: dict[tuple[U, U], list[U]] = {}
+    best: dict[tuple[U, U], Weight] = {}
+
+    for node in kept:
+        for nxt, w in edges[node]:
+            prev, cur, total = node, nxt, w
+            interior: list[U] = []
+            on_walk: set[U] = set()
+            while cur not in kept_set:
+                # Pass-through nodes form simple chains, so a walk can only come
+                # back to one (and never reach a kept node) when directed=False
+                # is used on a graph whose edges aren't symmetric.
+                if cur in on_walk:
+                    break
+                on_walk.add(cur)
+                interior.append(cur)
+                step = edges[cur]
+                if directed or step[0][0] != prev:
+                    prev, (cur, w) = cur, step[0]
+                else:
+                    prev, (cur, w) = cur, step[1]
+                total += w
+            else:
+                result[node].append((cur, total))
+                if total < best.get((node, cur), inf):
+                    best[(node, cur)] = total
+                    via[(node, cur)] = interior
+
+    return CompressedGraph(graph=result, via=via)
+
+
+class InternedDist(Mapping[T, Any]):
+    """Read-only map keyed by the nodes of a CompiledGraph, backed by an id-indexed list.
+
+    Entries equal to `missing` are absent. With node_values=True the stored
+    values are node ids too (parent maps) and are returned as nodes. Nothing
+    is translated until it is read, so a search pays for the nodes it reports
+    rather than for every node it reached; `data` holds the raw ids.
+    """
+
+    def __init__(
+        self,
+        data: list,
+        graph: CompiledGraph[T],
+        missing: Any = -1,
+        *,
+        node_values: bool = False,
+    ) -> None:
+        self.data = data
+        self.graph = graph
+        self.missing = missing
+        self.node_values = node_values
+
+    def __getitem__(self, key: T) -> Any:
+        value = self.data[self.graph.index[key]]
+        if value == self.missing:
+            raise KeyError(key)
+        return self.graph.nodes[value] if self.node_values else value
+
+    def __contains__(self, key: object) -> bool:
+        i = self.graph.index.get(key)  # type: ignore[call-overload]
+        return i is not None and self.data[i] != self.missing
+
+    def __iter__(self) -> Iterator[T]:
+        nodes, missing = self.graph.nodes, self.missing
+        return (nodes[i] for i, d in enumerate(self.data) if d != missing)
+
+    def __len__(self) -> int:
+        return len(self.data) - self.data.count(self.missing)
+
+
+class CompiledGraph(Generic[T]):
+    """A graph interned to dense integer ids and stored as CSR lists.
+
+    Node i has edges to targets[offsets[i]:offsets[i + 1]] (with matching
+    weights, or weight 1 when unweighted). Searches run on plain ints and
+    lists instead of hashing states and calling a neighbors callback, and
+    return InternedDist results, so ids are mapped back to nodes only for
+    the entries that are actually read.
+
+    Pass an instance as `neighbors` to bfs/dijkstra/astar, or call its
+    methods directly.
+    """
+
+    def __init__(
+        self,
+        nodes: list[T],
+        offsets: Sequence[int],
+        targets: Sequence[int],
+        weights: Sequence[Weight] | None = None,
+        *,
+        index: dict[T, int] | None = None,
+    ) -> None:
+        self.nodes = nodes
+        self.index: dict[T, int] = (
+            {node: i for i, node in enumerate(nodes)} if index is None else index
+        )
+        # Lists, not arrays: indexing an array boxes a new int every time.
+        self.offsets: list[int] = list(offsets)
+        self.targets: list[int] = list(targets)
+        self.weights: list[Weight] | None = None if weights is None else list(weights)
+        # Set when every weight is a small non-negative int (bucket queue usable).
+        self.max_weight: int | None = None
+        if self.weights is None:
+            self.max_weight = 1
+        elif all(w.__class__ is int for w in self.weights) and min(self.weights, default=0) >= 0:
+            top = max(self.weights, default=0)
+            self.max_weight = top if top <= DIAL_MAX_WEIGHT else None
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: Mapping[T, Iterable[T]] | Mapping[T, Iterable[tuple[T, Weight]]],
+        *,
+        weighted: bool = False,
+    ) -> CompiledGraph[T]:
+        """Compile an adjacency mapping (e.g. from build_graph).
+
+        weighted=True means the mapping holds (neighbor, weight) pairs.
+        Nodes that only appear as neighbors become nodes without edges.
+        """
+        index: dict[T, int] = {node: i for i, node in enumerate(graph)}
+        nodes: list[T] = list(graph)
+        offsets = [0]
+        targets: list[int] = []
+        weights: list[Weight] | None = [] if weighted else None
+
+        for node in list(graph):
+            for edge in graph[node]:
+                if weights is not None:
+                    nxt, w = edge  # type: ignore[misc]
+                    weights.append(w)
+                else:
+                    nxt = edge  # type: ignore[assignment]
+                i = index.get(nxt)
+                if i is None:
+                    i = index[nxt] = len(nodes)
+                    nodes.append(nxt)
+                targets.append(i)
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (len(nodes) + 1 - len(offsets)))
+        return cls(nodes, offsets, targets, weights, index=index)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.index
+
+    def neighbors(self, node: T) -> list[T]:
+        """Callback-style neighbours, for code that wants a plain function."""
+        i = self.index[node]
+        return [self.nodes[j] for j in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+
+    def _start_ids(self, starts: Iterable[T]) -> list[int]:
+        try:
+            return [self.index[s] for s in starts]
+        except KeyError as exc:
+            raise KeyError(f"{exc.args[0]!r} is not a node of this graph") from None
+
+    def _result(
+        self,
+        dist: list,
+        parent: list[int] | None,
+        found: int,
+        missing: Weight,
+    ) -> SearchResult[T] | CostResult[T]:
+        return _result(
+            InternedDist(dist, self, missing),
+            None if parent is None else InternedDist(parent, self, node_values=True),
+            self.nodes[found] if found >= 0 else None,
+        )
+
+    def bfs(
+        self,
+        starts: Iterable[T],
+        is_goal: Callable[[T], bool] | None = None,
+        *,
+        track_parents: bool = True,
+    ) -> SearchResult[T] | CostResult[T]:
+        """Breadth-first search ignoring edge weights (see bfs)."""
+        nodes, offsets, targets = self.nodes, self.offsets, self.targets
+        dist = [-1] * len(nodes)
+        parent = [-1] * len(nodes)
+        queue: list[int] = []
+
+        for s in self._start_ids(starts):
+            if dist[s] < 0:
+                dist[s] = 0
+                queue.append(s)
+
+        found = -1
+        for cur in queue:  # the list grows while it is iterated: a FIFO queue
+            if is_goal is not None and is_goal(nodes[cur]):
+                found = cur
+                break
+            d_next = dist[cur] + 1
+            for nxt in targets[offsets[cur]:offsets[cur + 1]]:
+                if dist[nxt] < 0:
+                    dist[nxt] = d_next
+                    parent[nxt] = cur
+                    queue.append(nxt)
+
+        return self._result(dist, parent if track_parents else None, found, -1)
+
+    def dijkstra(
+        self,
+        starts: Iterable[T],
+        is_goal: Callable[[T], bool] | None = None,
+        heuristic: Callable[[T], float] | None = None,
+        *,
+        track_parents: bool = True,
+    ) -> SearchResult[T] | CostResult[T]:
+        """Dijkstra's algorithm (see dijkstra), or A* when given a heuristic.
+
+        Without a heuristic, unweighted graphs run bfs and graphs with int
+        weights up to DIAL_MAX_WEIGHT use a bucket queue (as dijkstra_buckets
+        does) instead of a heap.
+        """
+        if heuristic is None and self.weights is None:
+            return self.bfs(starts, is_goal, track_parents=track_parents)
+        if heuristic is None and self.max_weight is not None:
+            return self._dial(starts, is_goal, track_parents)
+
+        nodes, offsets, targets = self.nodes, self.offsets, self.targets
+        weights = self.weights
+        dist: list[Weight] = [inf] * len(nodes)
+        parent = [-1] * len(nodes)
+        heap: list[tuple[float, Weight, int]] = []
+
+        def _h(i: int) -> float:
+            return 0.0 if heuristic is None else float(heuristic(nodes[i]))
+
+        for s in self._start_ids(starts):
+            if dist[s] == inf:
+                dist[s] = 0
+                heapq.heappush(heap, (_h(s), 0, s))
+
+        found = -1
+        while heap:
+            _f, d_cur, cur = heapq.heappop(heap)
+            if d_cur != dist[cur]:
+                continue
+            if is_goal is not None and is_goal(nodes[cur]):
+                found = cur
+                break
+            lo, hi = offsets[cur], offsets[cur + 1]
+            edges = (
+                zip(targets[lo:hi], repeat(1)) if weights is None
+                else zip(targets[lo:hi], weights[lo:hi])
+            )
+            for nxt, w in edges:
+                new_d = d_cur + w
+                if new_d < dist[nxt]:
+                    dist[nxt] = new_d
+                    parent[nxt] = cur
+                    priority = new_d if heuristic is None else new_d + _h(nxt)
+                    heapq.heappush(heap, (priority, new_d, nxt))
+
+        return self._result(dist, parent if track_parents else None, found, inf)
+
+    def _dial(
+        self,
+        starts: Iterable[T],
+        is_goal: Callable[[T], bool] | None,
+        track_parents: bool,
+    ) -> SearchResult[T] | CostResult[T]:
+        """dijkstra_buckets over the CSR lists (weights are ints in 0..max_weight)."""
+        nodes, offsets, targets = self.nodes, self.offsets, self.targets
+        weights = cast(list[int], self.weights)
+        size = cast(int, self.max_weight) + 1
+        buckets: list[list[int]] = [[] for _ in range(size)]
+        dist: list[Weight] = [inf] * len(nodes)
+        parent = [-1] * len(nodes)
+        pending = 0
+
+        for s in self._start_ids(starts):
+            if dist[s] != 0:
+                dist[s] = 0
+                buckets[0].append(s)
+                pending += 1
+
+        found = -1
+        d_cur = 0
+        while pending:
+            bucket = buckets[d_cur % size]
+            while bucket:
+                cur = bucket.pop()
+                pending -= 1
+                if dist[cur] != d_cur:
+                    continue
+                if is_goal is not None and is_goal(nodes[cur]):
+                    found = cur
+                    break
+                lo, hi = offsets[cur], offsets[cur + 1]
+                for nxt, w in zip(targets[lo:hi], weights[lo:hi]):
+                    new_d = d_cur + w
+                    if new_d < dist[nxt]:
+                        dist[nxt] = new_d
+                        parent[nxt] = cur
+                        buckets[new_d % size].append(nxt)
+                        pending += 1
+            if found >= 0:
+                break
+            d_cur += 1
+
+        return self._result(dist, parent if track_parents else None, found, inf)
+
+
+def compile_graph(
+    graph: Mapping[T, Iterable[T]] | Mapping[T, Iterable[tuple[T, Weight]]],
+    *,
+    weighted: bool = False,
+) -> CompiledGraph[T]:
+    """Intern an adjacency mapping into a CompiledGraph (see CompiledGraph.from_graph)."""
+    return CompiledGraph.from_graph(graph, weighted=weighted)
+
+
+def strongly_connected_components(graph: Mapping[U, Iterable[U]]) -> list[list[U]]:
+    """Tarjan's algorithm (iterative): the strongly connected components of graph.
+
+    Components come out in reverse topological order: a component is listed
+    before every component with an edge into it (sinks first).
+    """
+    index: dict[U, int] = {}
+    low: dict[U, int] = {}
+    on_stack: set[U] = set()
+    stack: list[U] = []
+    components: list[list[U]] = []
+
+    def _visit(node: U) -> None:
+        index[node] = low[node] = len(index)
+        stack.append(node)
+        on_stack.add(node)
+        work.append((node, iter(graph.get(node, ()))))
+
+    for root in graph:
+        if root in index:
+            continue
+        work: list[tuple[U, Iterator[U]]] = []
+        _visit(root)
+        while work:
+            node, it = work[-1]
+            for nxt in it:
+                if nxt not in index:
+                    _visit(nxt)
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            else:
+                work.pop()
+                if work:
+                    up = work[-1][0]
+                    low[up] = min(low[up], low[node])
+                if low[node] == index[node]:
+                    component: list[U] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+@dataclass
+class Condensation(Generic[U]):
+    """A graph with each strongly connected component collapsed to one node.
+
+    Component ids are numbered in topological order (sources first).
+    members[c]: the nodes of component c.
+    component_of: node -> component id.
+    dag: component id -> ids of the components it has edges to.
+    cyclic[c]: True if component c contains a cycle (size > 1 or a self-loop).
+    """
+    graph: Mapping[U, Iterable[U]]
+    members: list[list[U]]
+    component_of: dict[U, int]
+    dag: dict[int, list[int]]
+    cyclic: list[bool]
+
+    @property
+    def order(self) -> list[int]:
+        """Component ids in topological order."""
+        return list(range(len(self.members)))
+
+    def reaches(self, a: U, b: U) -> bool:
+        """True if there is a path from a to b."""
+        target = self.component_of[b]
+        return target in reachable([self.component_of[a]], self.dag)
+
+    def relevant_subgraph(self, start: U, goals: Iterable[U]) -> dict[U, list[U]]:
+        """The part of the graph lying on some path from start to a goal.
+
+        Goals are end points, so their own out-edges are dropped. Raises
+        CycleError if a cycle lies on such a path (infinitely many paths);
+        cycles elsewhere are fine.
+        """
+        goal_set = set(goals)
+        if start not in self.component_of:
+            return {}
+        forward = reachable([self.component_of[start]], self.dag)
+        backward = reachable(
+            (self.component_of[g] for g in goal_set if g in self.component_of),
+            reverse_graph(self.dag),
+        )
+        relevant = forward & backward
+        sub: dict[U, list[U]] = {}
+        for c in relevant:
+            for node in self.members[c]:
+                if node in goal_set:
+                    sub[node] = []
+                    continue
+                if self.cyclic[c]:
+                    raise CycleError(f"Cycle through {node!r} lies on a path to the goal.")
+                sub[node] = [
+                    n for n in self.graph.get(node, ())
+                    if self.component_of[n] in relevant
+                ]
+        return sub
+
+    def count_paths(self, start: U, goals: Iterable[U]) -> int:
+        """Count paths from start to any goal in linear time.
+
+        Cycles that can't be part of such a path are ignored; raises
+        CycleError if one can (there are infinitely many paths then).
+        """
+        goal_set = set(goals)
+        sub = self.relevant_subgraph(start, goal_set)
+        if start not in sub:
+            return 0
+        ways: dict[U, int] = {}
+        for c in reversed(self.order):
+            for node in self.members[c]:
+                if node in sub:
+                    ways[node] = 1 if node in goal_set else sum(ways[n] for n in sub[node])
+        return ways[start]
+
+
+def condense(graph: Mapping[U, Iterable[U]]) -> Condensation[U]:
+    """Collapse the strongly connected components of graph into a DAG."""
+    components = strongly_connected_components(graph)
+    components.reverse()  # topological order
+    component_of = {node: c for c, members in enumerate(components) for node in members}
+    dag: dict[int, list[int]] = {}
+    cyclic: list[bool] = []
+    for c, members in enumerate(components):
+        targets: dict[int, None] = {}
+        loops = len(members) > 1
+        for node in members:
+            for n in graph.get(node, ()):
+                t = component_of[n]
+                if t == c:
+                    loops = True
+                else:
+                    targets[t] = None
+        dag[c] = list(targets)
+        cyclic.append(loops)
+    return Condensation(
+        graph=graph,
+        members=components,
+        component_of=component_of,
+        dag=dag,
+        cyclic=cyclic,
+    )
+
+
+def _explore(
+    start: T,
+    neighbors: Callable[[T], Iterable[T]],
+    is_leaf: Callable[[T], bool],
+) -> dict[T, list[T]]:
+    """The graph reachable from start as an adjacency dict (leaves unexpanded)."""
+    graph: dict[T, list[T]] = {}
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if node in graph:
+            continue
+        graph[node] = [] if is_leaf(node) else list(neighbors(node))
+        stack.extend(n for n in graph[node] if n not in graph)
+    return graph
 
 
 def reduce_paths(
@@ -282,6 +1423,7 @@ def reduce_paths(
     goal_value: R | Callable[[T], R],
     invalid_value: R | Callable[[T], R],
     empty_value: R | Callable[[T], R],
+    memo: dict[T, R] | None = None,
 ) -> R:
     """Reduce path-values in a DAG from start to a goal.
 
@@ -291,41 +1433,147 @@ def reduce_paths(
       - else       -> reduce_fn(dp(child) for child in neighbors(node))
                       (or empty_value(node) if no children)
 
-    Raises ValueError if a cycle is detected.
+    Nodes are evaluated iteratively in post-order, so the depth of the DAG is
+    not limited by Python's recursion limit. dp values are stored in `memo`:
+    pass your own dict to reuse them across calls on the same graph and goal
+    (e.g. many start nodes), and len(memo) to see how many nodes were solved.
+
+    Raises CycleError (a ValueError) if a cycle is detected.
     """
     if is_goal is None and goal is None:
         raise ValueError("Must supply either goal or is_goal.")
+    if memo is None:
+        memo = {}
 
     def _val(v: R | Callable[[T], R], node: T) -> R:
         return v(node) if callable(v) else v
 
+    def _leaf(node: T) -> bool:
+        """Store the value of an invalid or goal node; True if it was one."""
+        if is_valid is not None and not is_valid(node):
+            memo[node] = _val(invalid_value, node)
+            return True
+        if is_goal(node) if is_goal is not None else node == goal:
+            memo[node] = _val(goal_value, node)
+            return True
+        return False
+
     visiting: set[T] = set()
+    # Frames are (node, children); children is None until the node is expanded.
+    stack: list[tuple[T, list[T] | None]] = [(start, None)]
 
-    @cache
-    def dp(node: T) -> R:
-        if is_valid is not None and not is_valid(node):
-            return _val(invalid_value, node)
+    while stack:
+        node, children = stack[-1]
+        if children is None:
+            if node in memo or _leaf(node):
+                stack.pop()
+                continue
+            children = list(neighbors(node))
+            visiting.add(node)
+            stack[-1] = (node, children)
+            for nxt in children:
+                if nxt in memo:
+                    continue
+                if nxt in visiting:
+                    raise CycleError("Cycle detected: reduce_paths requires a DAG.")
+                stack.append((nxt, None))
+            continue
 
-        if is_goal is not None:
-            if is_goal(node):
-                return _val(goal_value, node)
+        stack.pop()
+        visiting.discard(node)
+        if not children:
+            memo[node] = _val(empty_value, node)
         else:
-            if node == goal:
-                return _val(goal_value, node)
+            memo[node] = reduce_fn([memo[nxt] for nxt in children])
 
-        if node in visiting:
-            raise ValueError("Cycle detected: reduce_paths requires a DAG.")
+    return memo[start]
 
-        visiting.add(node)
-        try:
-            vals = [dp(nxt) for nxt in neighbors(node)]
-            if not vals:
-                return _val(empty_value, node)
-            return reduce_fn(vals)
-        finally:
-            visiting.remove(node)
 
-    return dp(start)
+def _postorder_ids(
+    start: T,
+    neighbors: Callable[[T], Iterable[T]],
+    is_leaf: Callable[[T], bool],
+) -> tuple[list[T], list[list[int]]]:
+    """Intern the DAG reachable from start to ints, numbered in post-order.
+
+    Returns (nodes, children) where children[i] holds the ids of node i's
+    successors, all smaller than i. Leaf nodes are not expanded.
+    Raises ValueError if a cycle is detected.
+    """
+    ids: dict[T, int] = {}
+    nodes: list[T] = []
+    children: list[list[int]] = []
+    visiting: set[T] = set()
+    stack: list[tuple[T, list[T] | None]] = [(start, None)]
+
+    while stack:
+        node, succ = stack[-1]
+        if succ is None:
+            if node in ids:
+                stack.pop()
+                continue
+            succ = [] if is_leaf(node) else list(neighbors(node))
+            visiting.add(node)
+            stack[-1] = (node, succ)
+            for nxt in succ:
+                if nxt in ids:
+                    continue
+                if nxt in visiting:
+                    raise CycleError("Cycle detected: count_paths requires a DAG.")
+                stack.append((nxt, None))
+            continue
+
+        stack.pop()
+        visiting.discard(node)
+        ids[node] = len(nodes)
+        nodes.append(node)
+        children.append([ids[nxt] for nxt in succ])
+
+    return nodes, children
+
+
+def _count_paths_masked(
+    start: T,
+    neighbors: Callable[[T], Iterable[T]],
+    is_goal: Callable[[T], bool],
+    is_valid: Callable[[T], bool] | None,
+    must_visit: Iterable[T],
+) -> int:
+    """count_paths restricted to paths through every node of must_visit.
+
+    ways[i][mask] is the number of paths from node i to a goal that visit
+    exactly the must_visit nodes in `mask`; one post-order sweep fills in all
+    2^k masks at once.
+    """
+    bit = {node: 1 << i for i, node in enumerate(dict.fromkeys(must_visit))}
+    size = 1 << len(bit)
+
+    def _is_leaf(node: T) -> bool:
+        return (is_valid is not None and not is_valid(node)) or is_goal(node)
+
+    nodes, children = _postorder_ids(start, neighbors, _is_leaf)
+    ways: list[list[int]] = []
+    for node, succ in zip(nodes, children):
+        if is_valid is not None and not is_valid(node):
+            ways.append([0] * size)
+            continue
+        if is_goal(node):
+            vec = [1] + [0] * (size - 1)
+        else:
+            vec = [0] * size
+            for c in succ:
+                for m, n in enumerate(ways[c]):
+                    if n:
+                        vec[m] += n
+        b = bit.get(node)
+        if b is not None:
+            shifted = [0] * size
+            for m, n in enumerate(vec):
+                shifted[m | b] += n
+            vec = shifted
+        ways.append(vec)
+
+    return ways[-1][size - 1]
 
 
 def count_paths(
@@ -335,16 +1583,122 @@ def count_paths(
     *,
     is_goal: Callable[[T], bool] | None = None,
     is_valid: Callable[[T], bool] | None = None,
+    memo: dict[T, int] | None = None,
+    must_visit: Iterable[T] | None = None,
 ) -> int:
-    """Count paths in a DAG from start to a goal (by value or predicate)."""
-    return reduce_paths(
-        start,
-        neighbors,
-        goal,
-        is_goal=is_goal,
-        is_valid=is_valid,
-        reduce_fn=sum,
-        goal_value=1,
-        invalid_value=0,
-        empty_value=0,
+    """Count paths in a DAG from start to a goal (by value or predicate).
+
+    memo works as in reduce_paths: reuse it for more starts with the same goal.
+    must_visit: only count paths that pass through all of these nodes. The
+    visited subset is tracked as a bitmask per node, not in the states.
+
+    Cycles are fine as long as none lies on a path from start to a goal: the
+    reachable graph is then condensed and pruned to the relevant part (memo is
+    not used in that case). A cycle on such a path raises CycleError.
+    """
+    if is_goal is None:
+        if goal is None:
+            raise ValueError("Must supply either goal or is_goal.")
+        is_goal = lambda node: node == goal
+
+    try:
+        if must_visit is not None:
+            return _count_paths_masked(start, neighbors, is_goal, is_valid, must_visit)
+        return reduce_paths(
+            start,
+            neighbors,
+            is_goal=is_goal,
+            is_valid=is_valid,
+            reduce_fn=sum,
+            goal_value=1,
+            invalid_value=0,
+            empty_value=0,
+            memo=memo,
+        )
+    except CycleError:
+        pass
+
+    def _valid(node: T) -> bool:
+        return is_valid is None or is_valid(node)
+
+    explored = _explore(start, neighbors, lambda n: not _valid(n) or is_goal(n))
+    goals = [n for n in explored if _valid(n) and is_goal(n)]
+    cond = condense(explored)
+    if must_visit is None:
+        return cond.count_paths(start, goals)
+
+    sub = cond.relevant_subgraph(start, goals)
+    if start not in sub:
+        return 0
+    return _count_paths_masked(start, sub.__getitem__, is_goal, None, must_visit)
+
+
+@dataclass
+class BatchResult(Generic[R]):
+    """Results of solve_many, in the order the problems were given.
+
+    seconds[i] is the time spent solving problems[i] (inside the worker);
+    wall_seconds covers the whole batch, pool start-up included.
+    """
+    values: list[R]
+    seconds: list[float]
+    wall_seconds: float
+
+    def __iter__(self) -> Iterator[R]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def busy_seconds(self) -> float:
+        return sum(self.seconds)
+
+    def slowest(self, n: int = 5) -> list[tuple[int, float]]:
+        """(index, seconds) of the n slowest problems."""
+        return sorted(enumerate(self.seconds), key=lambda t: t[1], reverse=True)[:n]
+
+
+def _timed_solve(solver: Callable[[T], R], problem: T) -> tuple[R, float]:
+    start = perf_counter()
+    value = solver(problem)
+    return value, perf_counter() - start
+
+
+def solve_many(
+    problems: Iterable[T],
+    solver: Callable[[T], R],
+    *,
+    workers: int | None = None,
+    chunksize: int | None = None,
+) -> BatchResult[R]:
+    """Solve independent problems on a process pool, keeping their order.
+
+    solver and the problems are sent to worker processes, so they must be
+    picklable: use a module-level function, not a lambda or closure.
+    workers defaults to the CPU count; with workers <= 1 (or a single problem)
+    everything runs in this process. chunksize defaults to about four chunks
+    per worker, which keeps the pickling overhead low on many small problems.
+    """
+    problems = list(problems)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(problems))
+
+    start = perf_counter()
+    if workers <= 1:
+        timed = [_timed_solve(solver, p) for p in problems]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        if chunksize is None:
+            chunksize = max(1, len(problems) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            timed = list(pool.map(partial(_timed_solve, solver), problems, chunksize=chunksize))
+    wall = perf_counter() - start
+
+    return BatchResult(
+        values=[v for v, _ in timed],
+        seconds=[t for _, t in timed],
+        wall_seconds=wall,
     )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from .config import ROOT
+
+
+@dataclass
+class ImportTime:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    wall_seconds: float
+    imports: list[ImportTime] = field(default_factory=list)
+
+    @property
+    def total_us(self) -> int:
+        """Time spent importing, summed over top-level imports."""
+        return sum(imp.cumulative_us for imp in self.imports if imp.depth == 0)
+
+    def without(self, other: StartupProfile) -> StartupProfile:
+        """Drop the top-level imports (and their children) that `other` also made.
+
+        Profiling an empty script gives the interpreter's own startup imports,
+        which this strips so only the cost added by our code remains.
+        """
+        seen = {imp.name for imp in other.imports if imp.depth == 0}
+        kept: list[ImportTime] = []
+        group: list[ImportTime] = []
+        # importtime lists children before the module that imported them
+        for imp in self.imports:
+            group.append(imp)
+            if imp.depth == 0:
+                if imp.name not in seen:
+                    kept.extend(group)
+                group = []
+        return StartupProfile(wall_seconds=self.wall_seconds, imports=kept)
+
+    def slowest(self, n: int = 10) -> list[ImportTime]:
+        return sorted(self.imports, key=lambda imp: imp.cumulative_us, reverse=True)[:n]
+
+
+def parse_importtime(stderr: str) -> list[ImportTime]:
+    """Parse the `-X importtime` report ("import time: self | cumulative | name")."""
+    imports: list[ImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        imports.append(ImportTime(stripped, int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def profile_imports(modules: tuple[str, ...]) -> StartupProfile:
+    """Import `modules` in a fresh interpreter under -X importtime."""
+    code = "import importlib\n" + "".join(
+        f"importlib.import_module({m!r})\n" for m in modules
+    )
+    start = perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{proc.stderr}")
+    return StartupProfile(wall_seconds=wall, imports=parse_importtime(proc.stderr))
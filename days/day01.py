@@ -2,17 +2,15 @@ from __future__ import annotations
 
 from typing import Any
 
-import re
-
-from aoc.common import read_input, time_call
-from aoc.config import AOC_YEAR
+from aoc.parse import parse_lines
+from aoc.runner import run_day
 
 DAY = 1
 
 
 def parse_input(raw: str) -> Any:
     """Convert the raw text into a convenient structure."""
-    return raw.rstrip("\n").splitlines()
+    return parse_lines("{dir:char}{n:int}", raw)
 
 
 def part1(data: Any) -> Any:
@@ -20,11 +18,9 @@ def part1(data: Any) -> Any:
     
     zeroes = 0
     dial = 50
-    for line in data:
-        dir, n = re.findall(r"(\D)(\d+)", line)[0]
+    for dir, n in data.rows():
         if dir == "L":
-            n = -1 * int(n)
-        else: n = int(n)
+            n = -1 * n
         dial += n
         dial %= 100
         if dial == 0: zeroes += 1
@@ -37,9 +33,7 @@ def part2(data: Any) -> Any:
 
     zeroes = 0
     dial = 50
-    for line in data:
-        dir, n = re.findall(r"(\D)(\d+)", line)[0]
-        n = int(n)
+    for dir, n in data.rows():
         if dir == "L":
             for i in range(int(n)):
                 dial -= 1
@@ -55,11 +49,7 @@ def part2(data: Any) -> Any:
 
 
 def main() -> None:
-    p1 = time_call(lambda x: part1(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 1: {p1.value} ({p1.seconds:.3f}s)")
-
-    p2 = time_call(lambda x: part2(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 2: {p2.value} ({p2.seconds:.3f}s)")
+    run_day(DAY, parse_input, part1, part2)
 
 
 if __name__ == "__main__":
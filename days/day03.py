@@ -4,8 +4,7 @@ from typing import Any
 
 from re import findall
 
-from aoc.common import read_input, time_call
-from aoc.config import AOC_YEAR
+from aoc.runner import run_day
 
 DAY = 3
 
@@ -48,11 +47,7 @@ def part2(data: Any) -> Any:
 
 
 def main() -> None:
-    p1 = time_call(lambda x: part1(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 1: {p1.value} ({p1.seconds:.3f}s)")
-
-    p2 = time_call(lambda x: part2(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 2: {p2.value} ({p2.seconds:.3f}s)")
+    run_day(DAY, parse_input, part1, part2)
 
 
 if __name__ == "__main__":
@@ -5,8 +5,7 @@ from typing import Any
 from itertools import combinations
 from math import prod
 
-from aoc.common import read_input, time_call
-from aoc.config import AOC_YEAR
+from aoc.runner import run_day
 
 DAY = 8
 
@@ -49,7 +48,7 @@ def group_into_networks(dists, max_n = None, n_points=None):
     return networks
 
 
-def part1(data: Any, n) -> Any:
+def part1(data: Any, n: int = 1000) -> Any:
     """Solve part 1."""
     dists = sort_by_dist(data)
     networks = group_into_networks(dists, max_n=n)
@@ -66,11 +65,7 @@ def part2(data: Any) -> Any:
 
 
 def main() -> None:
-    p1 = time_call(lambda x: part1(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 1: {p1.value} ({p1.seconds:.3f}s)")
-
-    p2 = time_call(lambda x: part2(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 2: {p2.value} ({p2.seconds:.3f}s)")
+    run_day(DAY, parse_input, part1, part2)
 
 
 if __name__ == "__main__":
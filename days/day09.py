@@ -6,10 +6,9 @@ from itertools import combinations
 
 from aoc.progress import prog # Add a progress bar when needed (used as enumerate)
 
-from aoc.iteration import nwise
+from aoc.polygon import RectilinearPolygon
 
-from aoc.common import read_input, time_call
-from aoc.config import AOC_YEAR
+from aoc.runner import run_day
 
 DAY = 9
 
@@ -32,53 +31,20 @@ def part1(data: Any) -> Any:
 
 def part2(data: Any) -> Any:
     """Solve part 2."""
-
-    # Prepare edges
-    r_edges = {}
-    c_edges = {}
-    for (r, c), (rn, cn) in nwise(data, circular=True):
-        if r == rn:
-            if r not in r_edges: r_edges[r] = []
-            r_edges[r].append(range(min(c, cn), max(c, cn) + 1))
-        if c == cn:
-            if c not in c_edges: c_edges[c] = []
-            c_edges[c].append(range(min(r, rn), max(r, rn) + 1))
-
-    def eval_rect(p1, p2, a_max):
-        if p1[0] == p2[0] or p1[1] == p2[1]: return a_max # ignore single width
-
-        r1, c1 = min(p1[0], p2[0]), min(p1[1], p2[1]) 
-        r2, c2 = max(p1[0], p2[0]), max(p1[1], p2[1])
-
-        area = (r2-r1+1)*(c2-c1+1)
-        if area <= a_max: return a_max
-
-        for r in range(r1 + 1, r2):
-            if r in r_edges:
-                for ran in r_edges[r]:
-                    if c1+1 in ran or c2-1 in ran: return a_max
-        
-        for c in range(c1 + 1, c2):
-            if c in c_edges:
-                for ran in c_edges[c]:
-                    if r1+1 in ran or r2-1 in ran: return a_max
-
-        return area
+    polygon = RectilinearPolygon(data)
 
     a_max = 0
     total_comb = (len(data)*len(data)-1)//2
     for n, (p1, p2) in prog(combinations(data, 2), total=total_comb):
-        a_max = eval_rect(p1, p2, a_max)
-    
+        area = (abs(p2[0]-p1[0])+1)*(abs(p2[1]-p1[1])+1)
+        if area > a_max and polygon.contains_rect(p1, p2):
+            a_max = area
+
     return a_max
 
 
 def main() -> None:
-    p1 = time_call(lambda x: part1(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 1: {p1.value} ({p1.seconds:.3f}s)")
-
-    p2 = time_call(lambda x: part2(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 2: {p2.value} ({p2.seconds:.3f}s)")
+    run_day(DAY, parse_input, part1, part2)
 
 
 if __name__ == "__main__":
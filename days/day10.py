@@ -5,13 +5,12 @@ from typing import Any
 
 from re import findall
 from itertools import product
-from functools import cache, reduce
+from functools import cache, partial, reduce
 from operator import xor
 
-from aoc.search import bfs_one
+from aoc.search import bfs_bidirectional, solve_many
 
-from aoc.common import read_input, time_call
-from aoc.config import AOC_YEAR
+from aoc.runner import run_day
 
 DAY = 10
 
@@ -31,6 +30,17 @@ def parse_input(raw: str) -> Any:
     return out
 
 
+def fewest_light_presses(machine: tuple[int, list[int]]) -> int:
+    lights, bts = machine
+    # Pressing a button twice undoes it, so the moves are symmetric
+    return bfs_bidirectional(
+        start=0,
+        goal=lights,
+        neighbors=lambda l: [l^btn for btn in bts],
+        track_parents=False,
+    ).goal_cost()
+
+
 def part1(data: Any) -> Any:
     """Solve part 1."""
     # Recompute for modulo math
@@ -40,51 +50,44 @@ def part1(data: Any) -> Any:
         bts = [sum(2**n for n in b) for b in bts]
         machines.append((lights, bts))
 
-    def fewest_presses(lights, bts):
-        return bfs_one(
-            start=0,
-            neighbors=lambda l: [l^btn for btn in bts],
-            is_goal=lambda x: x == lights
-        ).goal_cost()
+    return sum(map(fewest_light_presses, machines))
 
-    return sum(fewest_presses(l,b) for l,b in machines) 
 
+def fewest_joltage_presses(data_row) -> int:
+    _, buttons, joltages = data_row
+    m_bts = tuple(sum(2**n for n in b) for b in buttons)
 
-def part2(data: Any) -> Any:
-    """Solve part 2."""
+    parity_map = {i: set() for i in range(2**len(joltages))}
+    for push_combination in product([0, 1], repeat=len(buttons)):
+        m_par = reduce(xor, (x for x, push in zip(m_bts, push_combination) if push), 0)
+        parity_map[m_par].add(push_combination)
 
-    def fewest_presses(data_row):
-        _, buttons, joltages = data_row
-        m_bts = tuple(sum(2**n for n in b) for b in buttons)
+    @cache
+    def _fewest_presses(joltages):
+        if any(j < 0 for j in joltages): return 10**8
+        if all(j == 0 for j in joltages): return 0
 
-        parity_map = {i: set() for i in range(2**len(joltages))}
-        for push_combination in product([0, 1], repeat=len(buttons)):
-            m_par = reduce(xor, (x for x, push in zip(m_bts, push_combination) if push), 0)
-            parity_map[m_par].add(push_combination)
+        m_par = sum((j & 1) << n for n, j in enumerate(joltages))
+        solutions = parity_map[m_par]
 
-        @cache
-        def _fewest_presses(joltages):
-            if any(j < 0 for j in joltages): return 10**8
-            if all(j == 0 for j in joltages): return 0
+        if len(solutions) == 0: return 10**8
 
-            m_par = sum((j & 1) << n for n, j in enumerate(joltages))
-            solutions = parity_map[m_par]
+        next = []
+        for pushes in solutions:
+            new_joltages = list(joltages)
+            for btn, push in zip(buttons, pushes):
+                if push:
+                    for j in btn: new_joltages[j] -= 1
+            next.append((tuple(j//2 for j in new_joltages), sum(pushes)))
 
-            if len(solutions) == 0: return 10**8
+        return min(p + 2 * _fewest_presses(nj) for nj, p in next)
 
-            next = []
-            for pushes in solutions:
-                new_joltages = list(joltages)
-                for btn, push in zip(buttons, pushes):
-                    if push:
-                        for j in btn: new_joltages[j] -= 1
-                next.append((tuple(j//2 for j in new_joltages), sum(pushes)))
+    return _fewest_presses(joltages)
 
-            return min(p + 2 * _fewest_presses(nj) for nj, p in next)
-        
-        return _fewest_presses(joltages)
 
-    return sum(map(fewest_presses, data))
+def part2(data: Any, workers: int | None = 1) -> Any:
+    """Solve part 2 (machines are solved on `workers` processes; None for all CPUs)."""
+    return sum(solve_many(data, fewest_joltage_presses, workers=workers))
 
 
 # def solve_z3(data_row):
@@ -123,11 +126,7 @@ def part2(data: Any) -> Any:
 
 
 def main() -> None:
-    p1 = time_call(lambda x: part1(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 1: {p1.value} ({p1.seconds:.3f}s)")
-
-    p2 = time_call(lambda x: part2(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 2: {p2.value} ({p2.seconds:.3f}s)")
+    run_day(DAY, parse_input, part1, partial(part2, workers=None))
 
 
 if __name__ == "__main__":
@@ -4,8 +4,7 @@ from typing import Any
 
 from aoc.search import build_graph, count_paths
 
-from aoc.common import read_input, time_call
-from aoc.config import AOC_YEAR
+from aoc.runner import run_day
 
 DAY = 11
 
@@ -26,28 +25,17 @@ def part1(data: Any) -> Any:
 
 def part2(data: Any) -> Any:
     """Solve part 2."""
-    
-    def neighbors(n):
-        node, dac, fft = n
-        if node not in data: return []
-        for nxt in data.get(node):
-            if nxt == "dac": yield nxt, True, fft
-            elif nxt == "fft": yield nxt, dac, True
-            else: yield nxt, dac, fft
 
     return count_paths(
-        start = ("svr", False, False),
-        neighbors=neighbors,
-        goal = ("out", True, True)
+        start="svr",
+        neighbors=lambda n: data.get(n, []),
+        goal="out",
+        must_visit=("dac", "fft"),
     )
 
 
 def main() -> None:
-    p1 = time_call(lambda x: part1(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 1: {p1.value} ({p1.seconds:.3f}s)")
-
-    p2 = time_call(lambda x: part2(parse_input(x)), read_input(DAY))
-    print(f"{AOC_YEAR} Day {DAY} - Part 2: {p2.value} ({p2.seconds:.3f}s)")
+    run_day(DAY, parse_input, part1, part2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import random
+import re
+
+import pytest
+from aoc import common
+from aoc.common import ints, iter_lines, read_bytes, stream_input
+
+
+@pytest.fixture(params=["regex", "numpy"])
+def scan_path(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(common, "INTS_NUMPY_MIN_BYTES", 0)
+    return request.param
+
+
+def test_ints_signs_and_ranges(scan_path):
+    assert list(ints("3-5, -7 x-8 a--9 10-11 -0")) == [3, 5, -7, -8, -9, 10, 11, 0]
+    assert list(ints(b"")) == []
+    assert list(ints("no numbers")) == []
+
+
+def test_ints_int64_limits(scan_path):
+    text = "9223372036854775807 -9223372036854775808 0000000000000000000001"
+    assert list(ints(text)) == [2**63 - 1, -2**63, 1]
+
+
+@pytest.mark.parametrize("text", ["9999999999999999999", "9223372036854775808", "-9223372036854775809"])
+def test_ints_overflow_raises(scan_path, text):
+    with pytest.raises(OverflowError):
+        ints(text)
+
+
+def test_ints_matches_regex(scan_path):
+    rng = random.Random(1)
+    for _ in range(500):
+        buf = bytes(rng.choice(b"0123456789--, \nx") for _ in range(rng.randint(0, 40)))
+        buf = re.sub(rb"[0-9]{19,}", b"1", buf)
+        expected = [int(x) for x in re.findall(rb"(?<![0-9])-?[0-9]+", buf)]
+        assert list(ints(buf)) == expected
+
+
+def test_read_bytes(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert read_bytes(empty) == b""
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"1,2\n3,4\n")
+    assert list(ints(read_bytes(path))) == [1, 2, 3, 4]
+
+
+# ---------------------------------------------------------------------------
+# Streaming input
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def day_input(tmp_path, monkeypatch):
+    """Write day 1's input.txt under a temporary INPUTS_DIR."""
+    monkeypatch.setattr(common, "INPUTS_DIR", tmp_path)
+    (tmp_path / "day01").mkdir()
+
+    def write(data: bytes) -> None:
+        (tmp_path / "day01" / "input.txt").write_bytes(data)
+
+    return write
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n"])
+def test_stream_input_lines(day_input, use_mmap, newline):
+    day_input(newline.join([b"1 2", b"", b"3 4", b"5", b""]))
+    records = stream_input(1, lambda line: list(ints(line)), use_mmap=use_mmap)
+    assert list(records) == [[1, 2], [3, 4], [5]]
+    assert list(stream_input(1, use_mmap=use_mmap)) == ["1 2", "3 4", "5"]
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n"])
+def test_stream_input_blocks(day_input, use_mmap, newline):
+    day_input(newline.join([b"a", b"b", b"", b"c", b"", b"", b"d", b"e", b""]))
+    assert list(stream_input(1, blocks=True, use_mmap=use_mmap)) == [["a", "b"], ["c"], ["d", "e"]]
+    assert list(stream_input(1, len, blocks=True, use_mmap=use_mmap)) == [2, 1, 2]
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_stream_input_empty_file(day_input, use_mmap):
+    day_input(b"")
+    assert list(stream_input(1, use_mmap=use_mmap)) == []
+    assert list(stream_input(1, blocks=True, use_mmap=use_mmap)) == []
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_iter_lines_path_and_buffer_agree(tmp_path, use_mmap):
+    data = b"x\r\n\ny\nlast"
+    path = tmp_path / "input.txt"
+    path.write_bytes(data)
+    expected = ["x", "", "y", "last"]
+    assert list(iter_lines(path, use_mmap=use_mmap)) == expected
+    assert list(iter_lines(data)) == expected
+    assert list(iter_lines(bytearray(b""))) == []
@@ -13,4 +13,4 @@ def test_example_part1():
 
 def test_example_part2():
     raw = read_example(DAY, idx=1)
-    assert part2(data) == 24
+    assert part2(parse_input(raw)) == 24
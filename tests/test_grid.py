@@ -0,0 +1,347 @@
+from __future__ import annotations
+import random
+
+import pytest
+from aoc.grid import (
+    DIR4,
+    DIR8,
+    FlatGrid,
+    Grid,
+    SparseGrid,
+    compress_axis,
+    compress_coords,
+    count_neighbors,
+    flood_fill,
+    flood_fill_flat,
+    peel,
+    run_automaton,
+)
+from aoc.search import bfs, dijkstra
+
+
+@pytest.fixture
+def np():
+    return pytest.importorskip("numpy")
+
+
+def random_mask(rng: random.Random, rows: int, cols: int, p: float = 0.5) -> list[list[bool]]:
+    return [[rng.random() < p for _ in range(cols)] for _ in range(rows)]
+
+
+# ---------------------------------------------------------------------------
+# Grid.from_bytes and count_neighbors
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n"])
+@pytest.mark.parametrize("trailing", [0, 1, 2])
+def test_grid_from_bytes_line_endings(np, newline, trailing):
+    grid = Grid.from_bytes(newline.join([b"ab.", b"#.c"]) + newline * trailing)
+    assert grid.shape == (2, 3)
+    assert grid.to_rows() == [["a", "b", "."], ["#", ".", "c"]]
+    assert str(grid) == "ab.\n#.c"
+
+
+def test_grid_from_bytes_single_line_and_empty(np):
+    assert Grid.from_bytes(b"xyz").to_rows() == [["x", "y", "z"]]
+    assert Grid.from_bytes(b"xyz\r\n").to_rows() == [["x", "y", "z"]]
+    assert Grid.from_bytes(b"").shape == (0, 0)
+    assert Grid.from_bytes(b"\n\n").shape == (0, 0)
+
+
+@pytest.mark.parametrize("raw", [b"ab\nc\n", b"ab\r\ncd\nef", b"ab\ncd\r\n\nef", b"ab\r\nc\r\n"])
+def test_grid_from_bytes_rejects_ragged_lines(np, raw):
+    with pytest.raises(ValueError):
+        Grid.from_bytes(raw)
+
+
+def test_grid_from_bytes_view_writability(np):
+    buf = bytearray(b"ab\r\ncd\r\n")
+    grid = Grid.from_bytes(buf)
+    assert grid.cells.flags.writeable
+    grid[1, 0] = "#"
+    assert bytes(buf) == b"ab\r\n#d\r\n"  # a view: writes land in buf
+
+    raw = b"ab\ncd\n"
+    grid = Grid.from_bytes(raw)
+    assert not grid.cells.flags.writeable
+    grid[0, 1] = "#"  # copies instead of failing
+    assert str(grid) == "a#\ncd" and raw == b"ab\ncd\n"
+
+
+@pytest.mark.parametrize("dirs", [DIR4, DIR8])
+def test_count_neighbors_matches_reference(np, dirs):
+    rng = random.Random(16)
+    for _ in range(100):
+        rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+        mask = random_mask(rng, rows, cols)
+        expected = [
+            [
+                sum(
+                    0 <= r + dr < rows and 0 <= c + dc < cols and mask[r + dr][c + dc]
+                    for dr, dc in dirs
+                )
+                for c in range(cols)
+            ]
+            for r in range(rows)
+        ]
+        assert count_neighbors(np.array(mask), dirs).tolist() == expected
+
+
+# ---------------------------------------------------------------------------
+# Flood fill and coordinate compression
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("dirs", [DIR4, DIR8])
+def test_flood_fill_flat_matches_flood_fill(dirs):
+    rng = random.Random(21)
+    for _ in range(200):
+        rows, cols = rng.randint(1, 10), rng.randint(1, 10)
+        walls = random_mask(rng, rows, cols, 0.4)
+        grid = [["#" if w else "." for w in row] for row in walls]
+        starts = [(rng.randrange(rows), rng.randrange(cols)) for _ in range(rng.randint(1, 2))]
+        expected = flood_fill(grid, starts, lambda _, v: v == ".", dirs=dirs)
+
+        blocked = bytes(w for row in walls for w in row)
+        seen = flood_fill_flat(blocked, cols, [r * cols + c for r, c in starts], dirs=dirs)
+        assert {divmod(k, cols) for k, hit in enumerate(seen) if hit} == expected
+
+
+def test_flood_fill_stays_inside_walls():
+    grid = [list(row) for row in ["..#..", ".##..", "#...."]]
+    inside = flood_fill(grid, [(0, 0)], lambda _, v: v == ".")
+    assert inside == {(0, 0), (0, 1), (1, 0)}
+    assert len(flood_fill(grid, [(0, 0)], lambda _, v: v == ".", dirs=DIR8)) == 11  # every open cell
+    blocked = bytes(v == "#" for row in grid for v in row)
+    assert sum(flood_fill_flat(blocked, 5, [0])) == 3
+
+
+def test_compress_axis_bands():
+    rng = random.Random(22)
+    for _ in range(200):
+        values = [rng.randint(-20, 20) for _ in range(rng.randint(1, 6))]
+        gaps, pad = rng.random() < 0.5, rng.random() < 0.5
+        axis = compress_axis(values, gaps=gaps, pad=pad)
+        lo, hi = axis.starts[0], axis.starts[-1]
+        assert lo == min(values) - pad and hi == max(values) + 1 + pad
+        for v in range(lo, hi):
+            i = axis.index(v)
+            assert axis.value(i) <= v < axis.value(i) + axis.length(i)
+        for v in values:
+            # every value starts a band; with gaps it is alone in it
+            assert axis.value(axis.index(v)) == v
+            assert axis.length(axis.index(v)) == 1 or not gaps
+        assert axis.span(0, len(axis) - 1) == hi - lo
+        for v in (lo - 1, hi):
+            with pytest.raises(IndexError):
+                axis.index(v)
+
+
+def test_compress_coords_area_and_pos():
+    coords = compress_coords([(2, 10), (7, 3)], gaps=True, pad=True)
+    assert coords.shape == (5, 5)
+    assert coords.index((2, 10)) == (1, 3) and coords.pos((1, 3)) == (2, 10)
+    assert coords.area(coords.index((4, 5))) == 4 * 6  # the gap rows 3..6, cols 4..9
+    assert coords.total_area(
+        (i, j) for i in range(1, 4) for j in range(1, 4)
+    ) == (7 - 2 + 1) * (10 - 3 + 1)
+
+
+def test_draw_line_covers_the_segment():
+    rng = random.Random(23)
+    for _ in range(200):
+        points = [(rng.randint(0, 30), rng.randint(0, 30)) for _ in range(4)]
+        a, b = rng.sample(points, 2)
+        b = (a[0], b[1]) if rng.random() < 0.5 else (b[0], a[1])
+        coords = compress_coords(points + [b], gaps=True, pad=True)
+        grid = coords.grid(0)
+        coords.draw_line(grid, a, b, 1)
+        expected = {
+            coords.index((r, c))
+            for r in range(min(a[0], b[0]), max(a[0], b[0]) + 1)
+            for c in range(min(a[1], b[1]), max(a[1], b[1]) + 1)
+        }
+        drawn = {(i, j) for i, row in enumerate(grid) for j, v in enumerate(row) if v}
+        assert drawn == expected
+        # each drawn cell lies on the segment, so its area is its share of the length
+        assert coords.total_area(drawn) == abs(a[0] - b[0]) + abs(a[1] - b[1]) + 1
+
+
+def test_draw_line_rejects_diagonals():
+    coords = compress_coords([(0, 0), (3, 3)])
+    with pytest.raises(ValueError):
+        coords.draw_line(coords.grid(0), (0, 0), (3, 3), 1)
+
+
+# ---------------------------------------------------------------------------
+# Cellular automata
+# ---------------------------------------------------------------------------
+
+def reference_step(alive: list[list[bool]], rule, dirs) -> list[list[bool]]:
+    rows, cols = len(alive), len(alive[0])
+    return [
+        [
+            rule(
+                alive[r][c],
+                sum(
+                    0 <= r + dr < rows and 0 <= c + dc < cols and alive[r + dr][c + dc]
+                    for dr, dc in dirs
+                ),
+            )
+            for c in range(cols)
+        ]
+        for r in range(rows)
+    ]
+
+
+def reference_run(alive, rule, dirs, max_steps=None):
+    changed = []
+    while max_steps is None or len(changed) < max_steps:
+        new = reference_step(alive, rule, dirs)
+        diff = sum(a != b for ra, rb in zip(alive, new) for a, b in zip(ra, rb))
+        if not diff:
+            break
+        alive = new
+        changed.append(diff)
+    return alive, changed
+
+
+@pytest.mark.parametrize("dirs", [DIR4, DIR8])
+def test_run_automaton_matches_reference(np, dirs):
+    rng = random.Random(17)
+    for _ in range(50):
+        alive = random_mask(rng, rng.randint(1, 10), rng.randint(1, 10), 0.4)
+        expected, changed = reference_run(alive, lambda a, n: n == 3 or (a and n == 2), dirs, 20)
+        sim = run_automaton(np.array(alive), lambda a, n: (n == 3) | (a & (n == 2)), dirs=dirs, max_steps=20)
+        assert sim.state.tolist() == expected
+        assert sim.changed == changed and sim.steps == len(changed)
+
+
+@pytest.mark.parametrize("dirs", [DIR4, DIR8])
+@pytest.mark.parametrize("limit", [2, 4])
+def test_peel_matches_reference(np, dirs, limit):
+    rng = random.Random(18 + limit)
+    for _ in range(100):
+        alive = random_mask(rng, rng.randint(1, 12), rng.randint(1, 12), 0.7)
+        expected, changed = reference_run(alive, lambda a, n: a and not n < limit, dirs)
+        sim = peel(np.array(alive), lambda n: n < limit, dirs=dirs)
+        assert sim.state.tolist() == expected
+        assert sim.changed == changed and sim.total_changed == sum(changed)
+
+
+# ---------------------------------------------------------------------------
+# FlatGrid
+# ---------------------------------------------------------------------------
+
+def random_char_grid(rng: random.Random, rows: int, cols: int) -> list[str]:
+    return ["".join(rng.choice("..#123") for _ in range(cols)) for _ in range(rows)]
+
+
+def tuple_neighbors(grid: list[str], dirs):
+    def _neighbors(pos):
+        r, c = pos
+        return [
+            (r + dr, c + dc)
+            for dr, dc in dirs
+            if 0 <= r + dr < len(grid) and 0 <= c + dc < len(grid[0]) and grid[r + dr][c + dc] != "#"
+        ]
+
+    return _neighbors
+
+
+@pytest.mark.parametrize("dirs", [DIR4, DIR8])
+def test_flat_grid_neighbors_match_tuples(dirs):
+    rng = random.Random(18)
+    for _ in range(50):
+        grid = random_char_grid(rng, rng.randint(1, 8), rng.randint(1, 8))
+        flat = FlatGrid(grid, dirs=dirs)
+        flat_neighbors = flat.neighbors(lambda v: v != "#")
+        expected = tuple_neighbors(grid, dirs)
+        for r in range(len(grid)):
+            for c in range(len(grid[0])):
+                i = flat.index((r, c))
+                assert flat.pos(i) == (r, c) and flat[i] == grid[r][c]
+                assert not flat.is_border(i)
+                assert sorted(flat.path_positions(flat_neighbors(i))) == sorted(expected((r, c)))
+
+
+def test_flat_grid_find():
+    flat = FlatGrid(["S.#", "#.E"])
+    assert flat.pos(flat.find_first("S")) == (0, 0)
+    assert flat.path_positions(flat.find_all("#")) == [(0, 2), (1, 0)]  # padding excluded
+    assert flat.find_first("X") is None
+
+
+@pytest.mark.parametrize("dirs", [DIR4, DIR8])
+def test_flat_grid_bfs_and_dijkstra_match_tuples(dirs):
+    rng = random.Random(19)
+    for _ in range(100):
+        grid = random_char_grid(rng, rng.randint(1, 8), rng.randint(1, 8))
+        flat = FlatGrid(grid, dirs=dirs)
+        start = (rng.randrange(len(grid)), rng.randrange(len(grid[0])))
+        neighbors = tuple_neighbors(grid, dirs)
+
+        expected = bfs([start], neighbors).dist
+        res = flat.bfs([start], lambda v: v != "#")
+        assert {flat.pos(i): d for i, d in res.dist.items()} == dict(expected)
+        for pos in expected:
+            path = flat.path_positions(res.path_to(flat.index(pos)))
+            assert path[0] == start and path[-1] == pos and len(path) == expected[pos] + 1
+
+        def cost(v: str) -> int:
+            return int(v) if v.isdigit() else 1
+
+        expected = dijkstra(
+            [start], lambda p: [(n, cost(grid[n[0]][n[1]])) for n in neighbors(p)]
+        ).dist
+        res = flat.dijkstra([start], cost, lambda v: v != "#", track_parents=False)
+        assert {flat.pos(i): d for i, d in res.dist.items()} == dict(expected)
+
+
+# ---------------------------------------------------------------------------
+# SparseGrid
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("tile_bits", [1, 2, 5])
+def test_sparse_grid_matches_dict(tile_bits):
+    rng = random.Random(19 + tile_bits)
+    grid: SparseGrid[str] = SparseGrid(".", tile_bits=tile_bits)
+    model: dict[tuple[int, int], str] = {}
+    for _ in range(2000):
+        pos = (rng.randint(-20, 20), rng.randint(-20, 20))
+        value = rng.choice("..#@")
+        grid[pos] = value
+        if value == ".":
+            model.pop(pos, None)
+        else:
+            model[pos] = value
+        if rng.random() < 0.1 and model:
+            victim = rng.choice(list(model))
+            del grid[victim], model[victim]
+
+        assert len(grid) == len(model)
+        if rng.random() < 0.05:
+            assert dict(grid.items()) == model
+            for probe in [pos, (pos[0] + 1, pos[1] - 1), (999, -999)]:
+                assert grid[probe] == model.get(probe, ".")
+                assert grid.get(probe) == model.get(probe)
+                assert (probe in grid) == (probe in model)
+            rows = [r for r, _ in model]
+            cols = [c for _, c in model]
+            expected = (min(rows), min(cols), max(rows), max(cols)) if model else None
+            assert grid.bbox() == expected
+
+
+def test_sparse_grid_region_and_render():
+    grid = SparseGrid.from_dict({(-3, -3): "#", (0, 0): "a", (0, 2): "b", (40, 40): "z"}, tile_bits=2)
+    assert sorted(grid.region(-1, -1, 1, 2)) == [((0, 0), "a"), ((0, 2), "b")]
+    assert list(grid.region(5, 5, 30, 30)) == []
+    assert grid.viewport((0, 0), (1, 2)) == [["a", ".", "b"], [".", ".", "."]]
+    assert grid.bbox() == (-3, -3, 40, 40)
+    del grid[(40, 40)]
+    del grid[(-3, -3)]
+    assert grid.bbox() == (0, 0, 0, 2)  # recomputed after the deletions
+    assert grid.render() == "a.b"
+    with pytest.raises(KeyError):
+        del grid[(5, 5)]
+    grid[(0, 0)] = grid[(0, 2)] = "."
+    assert len(grid) == 0 and grid.bbox() is None and grid.render() == ""
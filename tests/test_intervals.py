@@ -0,0 +1,79 @@
+from __future__ import annotations
+import random
+
+import pytest
+from aoc.intervals import IntervalSet, normalize
+
+
+def as_set(intervals) -> set[int]:
+    return {x for a, b in intervals for x in range(a, b)}
+
+
+def random_intervals(rng: random.Random) -> list[tuple[int, int]]:
+    # Short, dense intervals so touching, adjacent and empty ones are common
+    return [
+        (a, a + rng.randint(-1, 6))
+        for a in (rng.randint(-10, 20) for _ in range(rng.randint(0, 6)))
+    ]
+
+
+@pytest.fixture
+def pairs():
+    rng = random.Random(22)
+    return [(random_intervals(rng), random_intervals(rng)) for _ in range(500)]
+
+
+def test_normalize_merges_touching_and_adjacent():
+    assert normalize([(5, 8), (1, 3), (3, 4), (7, 10), (12, 12)]) == [(1, 4), (5, 10)]
+    assert normalize([range(1, 3), range(3, 5)]) == [(1, 5)]
+    assert normalize([]) == []
+
+
+def test_normalized_form(pairs):
+    for a, _ in pairs:
+        s = IntervalSet(a)
+        assert as_set(s) == as_set(a)
+        assert all(s.stops[i] < s.starts[i + 1] for i in range(len(s) - 1))
+        assert s.total_length() == len(as_set(a))
+
+
+def test_membership(pairs):
+    for a, _ in pairs:
+        s, expected = IntervalSet(a), as_set(a)
+        for x in range(-15, 30):
+            assert (x in s) == (x in expected)
+
+
+def test_members_sweep(pairs):
+    rng = random.Random(5)
+    for a, _ in pairs:
+        s, expected = IntervalSet(a), as_set(a)
+        values = [rng.randint(-15, 30) for _ in range(rng.randint(0, 20))]
+        assert list(s.members(values)) == sorted(v for v in values if v in expected)
+        assert s.count_members(values) == sum(v in expected for v in values)
+
+
+@pytest.mark.parametrize("op", ["__or__", "__and__", "__sub__"])
+def test_set_algebra(pairs, op):
+    set_op = {"__or__": set.__or__, "__and__": set.__and__, "__sub__": set.__sub__}[op]
+    for a, b in pairs:
+        result = getattr(IntervalSet(a), op)(IntervalSet(b))
+        expected = set_op(as_set(a), as_set(b))
+        assert as_set(result) == expected
+        assert result == IntervalSet((x, x + 1) for x in expected)
+
+
+def test_edge_cases():
+    empty = IntervalSet()
+    full = IntervalSet([(-100, 100)])
+    s = IntervalSet.from_inclusive([(3, 5), (10, 14)])
+    assert not empty and len(empty) == 0 and empty.total_length() == 0
+    assert s | empty == s and s & empty == empty and s - empty == s
+    assert empty - s == empty
+    assert s & full == s and s - full == empty and s | full == full
+    # touching half-open intervals share no point, adjacent ones merge
+    assert IntervalSet([(0, 5)]) & IntervalSet([(5, 10)]) == empty
+    assert IntervalSet([(0, 5)]) | IntervalSet([(5, 10)]) == IntervalSet([(0, 10)])
+    assert IntervalSet([(0, 10)]) - IntervalSet([(0, 10)]) == empty
+    assert list(IntervalSet([(0, 10)]) - IntervalSet([(3, 4)])) == [(0, 3), (4, 10)]
+    assert 5 in s and 6 not in s and 14 in s and 15 not in s
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from array import array
+
+import pytest
+from aoc.parse import compile_schema, parse_lines
+
+
+def test_field_types():
+    cols = parse_lines(
+        "{c:char}{n:int} {w:word} [{v:ints}] {rest:str}",
+        "L68 ab_1 [1, -2,3] anything goes\nR-5 x [7] \n",
+    )
+    assert cols.names == ("c", "n", "w", "v", "rest")
+    assert cols["c"] == "LR"
+    assert cols["n"] == array("q", [68, -5])
+    assert cols["w"] == ["ab_1", "x"]
+    assert cols["v"] == [(1, -2, 3), (7,)]
+    assert cols["rest"] == ["anything goes", ""]
+    assert len(cols) == 2
+    assert list(cols.rows()) == [
+        ("L", 68, "ab_1", (1, -2, 3), "anything goes"),
+        ("R", -5, "x", (7,), ""),
+    ]
+
+
+def test_default_type_is_str_and_literals_are_escaped():
+    cols = parse_lines("{name} (x.y) -> {n:int}", "a b (x.y) -> 3\n")
+    assert list(cols.rows()) == [("a b", 3)]
+    assert len(parse_lines("{name} (x.y) -> {n:int}", "a b (xzy) -> 3\n", strict=False)) == 0
+
+
+def test_brace_escapes():
+    cols = parse_lines("{{{k:word}}}={v:int}", "{a}=1\n{bc}=-2\n")
+    assert list(cols.rows()) == [("a", 1), ("bc", -2)]
+
+
+def test_blank_lines_are_skipped():
+    assert list(parse_lines("{n:int}", "\n1\n\n2\n\n").rows()) == [(1,), (2,)]
+
+
+def test_empty_input_gives_empty_columns():
+    cols = parse_lines("{d:char}{n:int}", "")
+    assert len(cols) == 0 and cols["d"] == "" and cols["n"] == array("q")
+
+
+def test_strict_mode_names_the_bad_line():
+    with pytest.raises(ValueError, match="'oops'"):
+        parse_lines("{d:char}{n:int}", "L1\noops\nR2\n")
+
+
+def test_non_strict_skips_unmatched_lines():
+    raw = "0:\n###\n.#.\n\n4x4: 0 0 0 0 2 0\n12x5: 1 0 1 0 2 2\n"
+    cols = parse_lines("{x:int}x{y:int}: {counts:ints}", raw, strict=False)
+    assert list(cols.rows()) == [(4, 4, (0, 0, 0, 0, 2, 0)), (12, 5, (1, 0, 1, 0, 2, 2))]
+
+
+def test_crlf_line_endings():
+    cols = parse_lines("{d:char}{n:int}", "L68\r\nR5\r\n")
+    assert list(cols.rows()) == [("L", 68), ("R", 5)]
+
+
+def test_schemas_are_compiled_once():
+    assert compile_schema("{n:int}") is compile_schema("{n:int}")
+    assert compile_schema("{d:char}{n:int}").parse_line("R12") == ("R", 12)
+
+
+@pytest.mark.parametrize("spec", ["{a:float}", "{a}{a}", "no fields"])
+def test_invalid_schemas(spec):
+    with pytest.raises(ValueError):
+        compile_schema(spec)
@@ -0,0 +1,540 @@
+from __future__ import annotations
+import os
+import random
+from array import array
+
+import pytest
+from aoc.search import (
+    CompiledGraph,
+    CycleError,
+    astar,
+    bfs,
+    bfs_01,
+    bfs_bidirectional,
+    build_graph,
+    compile_graph,
+    compress_graph,
+    condense,
+    count_paths,
+    dijkstra,
+    dijkstra_buckets,
+    read_graph,
+    reduce_paths,
+    reverse_graph,
+    solve_many,
+    strongly_connected_components,
+)
+
+
+def random_graph(rng: random.Random, n: int) -> dict[int, list[int]]:
+    return {i: [rng.randrange(n) for _ in range(rng.randint(0, 3))] for i in range(n)}
+
+
+def reach(graph: dict[int, list[int]], start: int) -> set[int]:
+    seen, stack = {start}, [start]
+    while stack:
+        for n in graph[stack.pop()]:
+            if n not in seen:
+                seen.add(n)
+                stack.append(n)
+    return seen
+
+
+# ---------------------------------------------------------------------------
+# Strongly connected components and condensation
+# ---------------------------------------------------------------------------
+
+def test_scc_matches_mutual_reachability():
+    rng = random.Random(14)
+    for _ in range(200):
+        graph = random_graph(rng, rng.randint(1, 20))
+        components = strongly_connected_components(graph)
+        assert sorted(n for c in components for n in c) == sorted(graph)
+        comp = {n: i for i, c in enumerate(components) for n in c}
+        reachable = {n: reach(graph, n) for n in graph}
+        for a in graph:
+            for b in graph:
+                mutual = b in reachable[a] and a in reachable[b]
+                assert (comp[a] == comp[b]) == mutual
+
+
+def test_condense_is_topologically_ordered():
+    rng = random.Random(15)
+    for _ in range(200):
+        graph = random_graph(rng, rng.randint(1, 20))
+        cond = condense(graph)
+        for c, targets in cond.dag.items():
+            assert c not in targets
+            assert all(t > c for t in targets)
+        for c, members in enumerate(cond.members):
+            has_loop = any(cond.component_of[n] == c for m in members for n in graph[m])
+            assert cond.cyclic[c] == has_loop
+        for a in graph:
+            for b in graph:
+                assert cond.reaches(a, b) == (b in reach(graph, a))
+
+
+def test_scc_long_chain_does_not_recurse():
+    n = 20_000  # far past the default recursion limit
+    graph = {i: [i + 1] for i in range(n)}
+    graph[n] = [0]
+    assert len(strongly_connected_components(graph)) == 1
+    chain = {i: [i + 1] for i in range(n)}
+    chain[n] = []
+    assert condense(chain).count_paths(0, [n]) == 1
+
+
+# ---------------------------------------------------------------------------
+# count_paths on cyclic graphs
+# ---------------------------------------------------------------------------
+
+def test_count_paths_ignores_cycle_off_the_path():
+    graph = {
+        "a": ["b", "c", "x"],
+        "b": ["d"],
+        "c": ["d"],
+        "d": ["out"],
+        "x": ["y"],  # x <-> y never reaches out
+        "y": ["x"],
+        "out": ["a"],  # out is a goal, so this edge isn't followed
+    }
+    assert count_paths("a", lambda n: graph.get(n, []), "out") == 2
+    assert count_paths("a", lambda n: graph.get(n, []), "out", must_visit=("c",)) == 1
+
+
+def test_count_paths_raises_on_cycle_on_the_path():
+    graph = {"a": ["b"], "b": ["c", "out"], "c": ["b"]}
+    with pytest.raises(CycleError):
+        count_paths("a", lambda n: graph.get(n, []), "out")
+    with pytest.raises(ValueError):  # CycleError is a ValueError
+        count_paths("a", lambda n: graph.get(n, []), "out", must_visit=("c",))
+
+
+def test_count_paths_cyclic_matches_brute_force():
+    rng = random.Random(16)
+    for _ in range(300):
+        n = rng.randint(1, 15)
+        graph = random_graph(rng, n)
+        start, goal = rng.randrange(n), rng.randrange(n)
+        useful = {x for x in graph if goal in reach(graph, x)}
+
+        def paths(x: int, path: frozenset[int]) -> int:
+            if x == goal:
+                return 1
+            if x in path:
+                raise CycleError
+            return sum(paths(y, path | {x}) for y in graph[x] if y in useful)
+
+        try:
+            expected = paths(start, frozenset())
+        except CycleError:
+            with pytest.raises(CycleError):
+                count_paths(start, graph.__getitem__, goal)
+        else:
+            assert count_paths(start, graph.__getitem__, goal) == expected
+
+
+def test_count_paths_long_cyclic_chain():
+    n = 20_000  # far past the default recursion limit
+    graph = {i: [i + 1] for i in range(n)}
+    graph[n] = []
+    graph[n // 2].append(n + 1)  # a dead-end loop hanging off the chain
+    graph[n + 1] = [n + 2]
+    graph[n + 2] = [n + 1]
+    assert count_paths(0, graph.__getitem__, n) == 1
+
+
+# ---------------------------------------------------------------------------
+# Bucket queues for small integer weights
+# ---------------------------------------------------------------------------
+
+def random_weighted(rng: random.Random, n: int, max_weight: int) -> dict[int, list[tuple[int, int]]]:
+    return {
+        i: [(rng.randrange(n), rng.randint(0, max_weight)) for _ in range(rng.randint(0, 4))]
+        for i in range(n)
+    }
+
+
+@pytest.mark.parametrize("max_weight", [1, 2, 9])
+def test_bucket_queues_match_heap_dijkstra(max_weight):
+    rng = random.Random(9 + max_weight)
+    for _ in range(200):
+        n = rng.randint(1, 30)
+        graph = random_weighted(rng, n, max_weight)
+        starts = rng.sample(range(n), min(n, rng.randint(1, 2)))
+        expected = dict(dijkstra(starts, graph.__getitem__).dist)
+
+        buckets = dijkstra_buckets(starts, graph.__getitem__, max_weight=max_weight)
+        assert dict(buckets.dist) == expected
+        for node in expected:
+            path = buckets.path_to(node)
+            assert path[0] in starts and path[-1] == node
+            cost = sum(min(w for t, w in graph[a] if t == b) for a, b in zip(path, path[1:]))
+            assert cost == expected[node]
+        assert dict(dijkstra(starts, graph.__getitem__, max_weight=max_weight).dist) == expected
+        if max_weight <= 1:
+            assert dict(bfs_01(starts, graph.__getitem__).dist) == expected
+
+
+def test_bucket_queues_stop_at_goal():
+    graph = {0: [(1, 2), (2, 0)], 1: [(3, 1)], 2: [(3, 2)], 3: []}
+    res = dijkstra_buckets([0], graph.__getitem__, lambda n: n == 3, max_weight=2)
+    assert res.goal == 3 and res.goal_cost() == 2
+    graph01 = {0: [(1, 1), (2, 0)], 1: [(3, 0)], 2: [(3, 1)], 3: []}
+    res = bfs_01([0], graph01.__getitem__, lambda n: n == 3, track_parents=False)
+    assert res.goal_cost() == 1
+
+
+@pytest.mark.parametrize("weight", [-1, 3, 1.5])
+def test_bucket_queues_reject_out_of_range_weights(weight):
+    graph = {0: [(1, weight)], 1: []}
+    with pytest.raises(ValueError):
+        dijkstra_buckets([0], graph.__getitem__, max_weight=2)
+    with pytest.raises(ValueError):
+        bfs_01([0], graph.__getitem__)
+
+
+def test_dijkstra_rejects_state_bound_with_max_weight():
+    graph = {0: [(1, 1)], 1: []}
+    with pytest.raises(ValueError):
+        dijkstra([0], graph.__getitem__, max_weight=1, state_bound=2)
+    assert dijkstra([0], graph.__getitem__, state_bound=2).cost_to(1) == 1
+
+
+# ---------------------------------------------------------------------------
+# solve_many
+# ---------------------------------------------------------------------------
+
+def square(x: int) -> int:
+    return x * x
+
+
+def pid(_: object) -> int:
+    return os.getpid()
+
+
+def fail_on_three(x: int) -> int:
+    if x == 3:
+        raise ValueError("three")
+    return x
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_solve_many_keeps_order(workers):
+    problems = list(range(50))
+    batch = solve_many(problems, square, workers=workers, chunksize=3)
+    assert list(batch) == [x * x for x in problems]
+    assert len(batch.seconds) == len(problems)
+
+
+def test_solve_many_serial_fallback_stays_in_process():
+    assert set(solve_many(range(5), pid, workers=1)) == {os.getpid()}
+    assert list(solve_many([7], pid, workers=8)) == [os.getpid()]  # one problem
+    assert list(solve_many([], square)) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_many_propagates_worker_errors(workers):
+    with pytest.raises(ValueError, match="three"):
+        solve_many(range(6), fail_on_three, workers=workers)
+
+
+# ---------------------------------------------------------------------------
+# Graph compression
+# ---------------------------------------------------------------------------
+
+def random_dag(rng: random.Random, n: int) -> dict[int, list[int]]:
+    return {
+        i: [rng.randrange(i + 1, n) for _ in range(rng.randint(0, 2))] if i < n - 1 else []
+        for i in range(n)
+    }
+
+
+def random_maze(rng: random.Random, rows: int, cols: int) -> dict[tuple[int, int], list[tuple[int, int]]]:
+    open_cells = {(r, c) for r in range(rows) for c in range(cols) if rng.random() < 0.65}
+    return {
+        (r, c): [
+            (r + dr, c + dc)
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if (r + dr, c + dc) in open_cells
+        ]
+        for r, c in open_cells
+    }
+
+
+def check_compressed_paths(graph, compressed, start, goal) -> None:
+    """Distances from start and expanded paths agree with the original graph."""
+    expected = bfs([start], lambda n: graph.get(n, [])).dist
+    res = dijkstra([start], compressed.weighted_neighbors)
+    for node, cost in res.dist.items():
+        assert cost == expected[node]
+    if goal in res.dist:
+        path = compressed.expand_path(res.path_to(goal))
+        assert path[0] == start and path[-1] == goal
+        assert len(path) - 1 == expected[goal]
+        assert all(b in graph[a] for a, b in zip(path, path[1:]))
+    else:
+        assert goal not in expected
+
+
+def test_compress_graph_directed_matches_original():
+    rng = random.Random(12)
+    for _ in range(300):
+        n = rng.randint(2, 25)
+        graph = random_dag(rng, n)
+        compressed = compress_graph(graph, starts=[0], goals=[n - 1])
+        assert count_paths(0, compressed.neighbors, n - 1) == count_paths(0, graph.__getitem__, n - 1)
+        check_compressed_paths(graph, compressed, 0, n - 1)
+
+        graph = random_graph(rng, n)  # cyclic: compare distances only
+        check_compressed_paths(graph, compress_graph(graph, starts=[0], keep=[n - 1]), 0, n - 1)
+
+
+def test_compress_graph_undirected_matches_original():
+    rng = random.Random(13)
+    for _ in range(200):
+        graph = random_maze(rng, rng.randint(1, 7), rng.randint(1, 7))
+        if len(graph) < 2:
+            continue
+        start, goal = rng.sample(sorted(graph), 2)
+        compressed = compress_graph(graph, starts=[start], goals=[goal], directed=False)
+        check_compressed_paths(graph, compressed, start, goal)
+
+
+def test_compress_graph_drops_loops_without_kept_nodes():
+    # An isolated cycle of pass-through nodes is dropped.
+    ring = {0: [1], 1: [2], 2: [0], "a": ["b"], "b": []}
+    assert compress_graph(ring, keep=["a", "b"]).graph == {"a": [("b", 1)], "b": []}
+    # directed=False on edges that aren't symmetric: the walk from "a" enters
+    # the loop p2 -> p3 -> p4 -> p2 and never comes back to a kept node.
+    lopsided = {"a": ["p1"], "p1": ["a", "p2"], "p2": ["p3", "p1"], "p3": ["p4", "p2"], "p4": ["p2", "p3"]}
+    assert compress_graph(lopsided, starts=["a"], directed=False).graph == {"a": []}
+
+
+# ---------------------------------------------------------------------------
+# Bidirectional BFS
+# ---------------------------------------------------------------------------
+
+def test_bfs_bidirectional_matches_bfs():
+    rng = random.Random(7)
+    for _ in range(300):
+        n = rng.randint(1, 30)
+        graph = random_graph(rng, n)
+        rev = reverse_graph(graph)
+        start, goal = rng.randrange(n), rng.randrange(n)
+        expected = bfs([start], graph.__getitem__).dist.get(goal)
+
+        res = bfs_bidirectional(start, goal, graph.__getitem__, rev.__getitem__)
+        assert res.goal_cost() == expected
+        path = res.path_to_goal()
+        if expected is None:
+            assert path is None
+        else:
+            assert path[0] == start and path[-1] == goal and len(path) == expected + 1
+            assert all(b in graph[a] for a, b in zip(path, path[1:]))
+        cost_only = bfs_bidirectional(start, goal, graph.__getitem__, rev.__getitem__, track_parents=False)
+        assert cost_only.goal_cost() == expected
+
+
+def test_bfs_bidirectional_symmetric_default():
+    rng = random.Random(8)
+    for _ in range(100):
+        graph = random_maze(rng, rng.randint(1, 8), rng.randint(1, 8))
+        if not graph:
+            continue
+        start, goal = rng.choice(sorted(graph)), rng.choice(sorted(graph))
+        expected = bfs([start], graph.__getitem__).dist.get(goal)
+        assert bfs_bidirectional(start, goal, graph.__getitem__).goal_cost() == expected
+
+
+# ---------------------------------------------------------------------------
+# reduce_paths memo reuse
+# ---------------------------------------------------------------------------
+
+def brute_paths(graph: dict[int, list[int]], start: int, goal: int) -> list[list[int]]:
+    if start == goal:
+        return [[goal]]
+    return [[start] + p for n in graph[start] for p in brute_paths(graph, n, goal)]
+
+
+def longest(start: int, neighbors, goal: int, memo=None) -> int:
+    return reduce_paths(
+        start,
+        neighbors,
+        goal,
+        reduce_fn=lambda values: max(values) + 1,
+        goal_value=0,
+        invalid_value=-(10**9),
+        empty_value=-(10**9),
+        memo=memo,
+    )
+
+
+def test_reduce_paths_memo_is_reused_across_starts():
+    rng = random.Random(10)
+    for _ in range(100):
+        n = rng.randint(2, 15)
+        graph = random_dag(rng, n)
+        goal = n - 1
+        expanded: list[int] = []
+
+        def neighbors(node: int) -> list[int]:
+            expanded.append(node)
+            return graph[node]
+
+        memo: dict[int, int] = {}
+        for start in rng.sample(range(n), n):
+            paths = brute_paths(graph, start, goal)
+            expected = max(map(len, paths)) - 1 if paths else None
+            value = longest(start, neighbors, goal, memo)
+            assert (value if value >= 0 else None) == expected
+            assert value == longest(start, graph.__getitem__, goal)  # fresh memo agrees
+        assert len(expanded) == len(set(expanded))  # no node expanded twice
+        assert set(memo) == set(graph)
+
+        counts: dict[int, int] = {}
+        for start in range(n):
+            assert count_paths(start, graph.__getitem__, goal, memo=counts) == len(brute_paths(graph, start, goal))
+
+
+def test_reduce_paths_long_chain_does_not_recurse():
+    n = 20_000
+    chain = {i: [i + 1] for i in range(n)}
+    memo: dict[int, int] = {}
+    assert longest(0, chain.__getitem__, n, memo) == n
+    assert len(memo) == n + 1 and longest(n // 2, chain.__getitem__, n, memo) == n - n // 2
+
+
+# ---------------------------------------------------------------------------
+# count_paths through required nodes
+# ---------------------------------------------------------------------------
+
+def test_count_paths_must_visit_matches_brute_force():
+    rng = random.Random(11)
+    for _ in range(300):
+        n = rng.randint(2, 14)
+        graph = random_dag(rng, n)
+        start, goal = 0, n - 1
+        must = rng.sample(range(n), min(n, rng.randint(0, 3)))
+        blocked = set(rng.sample(range(1, n - 1), min(n - 2, rng.randint(0, 2))))
+        paths = [p for p in brute_paths(graph, start, goal) if not blocked & set(p)]
+        expected = sum(all(m in p for m in must) for p in paths)
+        got = count_paths(start, graph.__getitem__, goal, must_visit=must, is_valid=lambda x: x not in blocked)
+        assert got == expected
+        assert count_paths(start, graph.__getitem__, is_goal=lambda x: x == goal, must_visit=must * 2) == sum(
+            all(m in p for m in must) for p in brute_paths(graph, start, goal)
+        )  # duplicates in must_visit are ignored
+
+
+# ---------------------------------------------------------------------------
+# read_graph
+# ---------------------------------------------------------------------------
+
+def parse_edges(line: str) -> tuple[str, list[str]]:
+    node, _, rest = line.partition(":")
+    return node, rest.split()
+
+
+def random_graph_lines(rng: random.Random) -> list[str]:
+    names = [f"n{i}" for i in range(rng.randint(1, 12))]
+    lines = [
+        f"{rng.choice(names)}: " + " ".join(rng.choice(names) for _ in range(rng.randint(0, 4)))
+        for _ in range(rng.randint(0, 15))
+    ]
+    return [line if rng.random() < 0.9 else "" for line in lines]
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+@pytest.mark.parametrize("dedupe", [False, True])
+def test_read_graph_matches_build_graph(tmp_path, bidirectional, dedupe):
+    rng = random.Random(13 + 2 * bidirectional + dedupe)
+    path = tmp_path / "graph.txt"
+    for _ in range(100):
+        lines = random_graph_lines(rng)
+        expected = build_graph(lines, parse_edges, bidirectional=bidirectional, dedupe=dedupe)
+        text = "\n".join(lines) + "\n"
+        path.write_text(text)
+        for source in (path, text.encode(), text.replace("\n", "\r\n").encode()):
+            graph = read_graph(source, parse_edges, bidirectional=bidirectional, dedupe=dedupe)
+            assert graph == expected and list(graph) == list(expected)
+
+        compiled = read_graph(path, parse_edges, bidirectional=bidirectional, dedupe=dedupe, csr=True)
+        for node, neighs in expected.items():
+            assert node in compiled
+            assert compiled.neighbors(node) == neighs
+
+
+# ---------------------------------------------------------------------------
+# CompiledGraph
+# ---------------------------------------------------------------------------
+
+def check_same_search(res, expected, graph) -> None:
+    """res (from a CompiledGraph) has expected's distances and valid paths."""
+    assert dict(res.dist) == dict(expected.dist)
+    assert len(res.dist) == len(expected.dist)
+    assert res.goal_cost() == expected.goal_cost()
+    for node in expected.dist:
+        assert node in res.dist
+        path = res.path_to(node)
+        assert path[-1] == node and path[0] in [p for p in expected.dist if expected.dist[p] == 0]
+        cost = sum(min(w for t, w in graph[a] if t == b) for a, b in zip(path, path[1:]))
+        assert cost == expected.dist[node]
+
+
+@pytest.mark.parametrize("weights", ["unit", "small", "large", "float"])
+def test_compiled_graph_matches_dict_searches(weights):
+    rng = random.Random(6)
+    top = {"unit": 1, "small": 9, "large": 5000, "float": 9}[weights]
+    for _ in range(150):
+        n = rng.randint(1, 30)
+        graph = {
+            f"n{node}": [(f"n{t}", rng.randint(0, top) if weights != "unit" else 1) for t, _ in es]
+            for node, es in random_weighted(rng, n, top).items()
+        }
+        if weights == "float":
+            graph = {node: [(t, w / 2) for t, w in es] for node, es in graph.items()}
+        compiled = compile_graph(graph, weighted=True)
+        assert len(compiled) == n and all(node in compiled for node in graph)
+        starts = rng.sample(sorted(graph), min(n, rng.randint(1, 2)))
+        goal = rng.choice(sorted(graph))
+
+        expected = dijkstra(starts, graph.__getitem__)
+        check_same_search(dijkstra(starts, compiled), expected, graph)
+        check_same_search(compiled.dijkstra(starts, heuristic=lambda _: 0), expected, graph)
+        cost_only = compiled.dijkstra(starts, track_parents=False)
+        assert dict(cost_only.dist) == dict(expected.dist)
+
+        expected = dijkstra(starts, graph.__getitem__, lambda x: x == goal)
+        res = astar(starts, lambda x: x == goal, compiled)
+        assert res.goal_cost() == expected.goal_cost()
+        res = compiled.dijkstra(starts, lambda x: x == goal)
+        assert res.goal_cost() == expected.goal_cost()
+        if res.goal is not None:
+            assert res.path_to_goal()[-1] == goal
+
+        plain = {node: [t for t, _ in es] for node, es in graph.items()}
+        expected = bfs(starts, plain.__getitem__)
+        res = bfs(starts, compile_graph(plain))
+        assert dict(res.dist) == dict(expected.dist)
+        assert all(len(res.path_to(node)) == d + 1 for node, d in expected.dist.items())
+
+
+def test_compiled_graph_results_map_ids_lazily():
+    compiled = compile_graph({"a": ["b"], "b": ["c"], "c": [], "x": ["a"]})
+    res = compiled.bfs(["a"])
+    assert res.dist.data == [0, 1, 2, -1]  # id-indexed, untranslated
+    assert list(res.dist) == ["a", "b", "c"] and len(res.dist) == 3
+    assert "x" not in res.dist and "nope" not in res.dist
+    assert res.cost_to("x") is None and res.path_to("x") is None
+    with pytest.raises(KeyError):
+        res.dist["x"]
+    assert dict(res.parent) == {"b": "a", "c": "b"}
+    assert res.path_to("c") == ["a", "b", "c"]
+    with pytest.raises(KeyError):
+        compiled.bfs(["nope"])
+
+
+def test_compiled_graph_from_csr_arrays():
+    graph = CompiledGraph(["a", "b", "c"], array("q", [0, 2, 3, 3]), array("q", [1, 2, 2]), array("q", [1, 5, 1]))
+    assert graph.max_weight == 5 and graph.neighbors("a") == ["b", "c"]
+    assert graph.dijkstra(["a"]).path_to("c") == ["a", "b", "c"]